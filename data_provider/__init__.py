@@ -24,17 +24,24 @@
 提示：优先级数字越小越优先，同优先级按初始化顺序排列
 """
 
+import importlib
+
 from .base import BaseFetcher, DataFetcherManager
-from .crypto_fetcher import CryptoFetcher
-from .coindesk_fetcher import CoindeskFetcher
-from .finnhub_fetcher import FinnhubFetcher
-from .massive_fetcher import MassiveFetcher
-from .efinance_fetcher import EfinanceFetcher
-from .akshare_fetcher import AkshareFetcher
-from .tushare_fetcher import TushareFetcher
-from .pytdx_fetcher import PytdxFetcher
-from .baostock_fetcher import BaostockFetcher
-from .yfinance_fetcher import YfinanceFetcher
+
+# 各数据源模块按需延迟加载（PEP 562）：只有首次访问时才导入，
+# 避免仅使用某一个数据源时也要加载 akshare/tushare/baostock 等重量级依赖
+_LAZY_FETCHERS = {
+    'CryptoFetcher': 'crypto_fetcher',
+    'CoindeskFetcher': 'coindesk_fetcher',
+    'FinnhubFetcher': 'finnhub_fetcher',
+    'MassiveFetcher': 'massive_fetcher',
+    'EfinanceFetcher': 'efinance_fetcher',
+    'AkshareFetcher': 'akshare_fetcher',
+    'TushareFetcher': 'tushare_fetcher',
+    'PytdxFetcher': 'pytdx_fetcher',
+    'BaostockFetcher': 'baostock_fetcher',
+    'YfinanceFetcher': 'yfinance_fetcher',
+}
 
 __all__ = [
     'BaseFetcher',
@@ -50,3 +57,18 @@ __all__ = [
     'BaostockFetcher',
     'YfinanceFetcher',
 ]
+
+
+def __getattr__(name: str):
+    """首次访问数据源类时导入对应模块，并缓存到模块命名空间"""
+    module_name = _LAZY_FETCHERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    fetcher_cls = getattr(module, name)
+    globals()[name] = fetcher_cls
+    return fetcher_cls
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
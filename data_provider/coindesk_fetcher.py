@@ -17,18 +17,47 @@ API文档：
 
 import logging
 import os
+import threading
+import time
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
 
 import requests
 import pandas as pd
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_random_exponential,
+    retry_if_exception_type,
+    before_sleep_log,
+)
 
-from data_provider.base import BaseFetcher, DataFetchError, RateLimitError
+from data_provider.base import STANDARD_COLUMNS, BaseFetcher, DataFetchError, RateLimitError
+from data_provider.http_utils import (
+    TTLCache,
+    TokenBucket,
+    build_session,
+    loads_json,
+    make_cache_key,
+    parse_retry_after,
+    record_request,
+)
+from data_provider.realtime_types import CryptoQuote
 
 logger = logging.getLogger(__name__)
 
 
+# Coindesk指数符号映射
+_COINDESK_SYMBOLS = MappingProxyType({
+    'BTC': 'XBT',
+    'ETH': 'ETH',
+    'BCH': 'BCH',
+    'LTC': 'LTC',
+    'XRP': 'XRP'
+})
+
+
 class CoindeskFetcher(BaseFetcher):
     """
     Coindesk数据获取器
@@ -43,6 +72,12 @@ class CoindeskFetcher(BaseFetcher):
     name = "Coindesk"
     priority = 2  # 高优先级（与Finnhub同级，虚拟货币备用源）
     
+    # 类级共享资源（首次实例化时创建）
+    _SESSION: Optional[requests.Session] = None
+    _CACHE: Optional[TTLCache] = None
+    _BUCKET: Optional[TokenBucket] = None
+    _SHARED_LOCK = threading.Lock()
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         初始化
@@ -51,36 +86,131 @@ class CoindeskFetcher(BaseFetcher):
             api_key: Coindesk API密钥（目前大部分API免费）
         """
         self.api_key = api_key or os.getenv("COINDESK_API_KEY")
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "StockAnalysisBot/1.0",
-            "Accept": "application/json"
-        })
+        # 按顺序尝试的API主机：主机返回5xx或连接失败时切换到下一个
+        self.fallback_base_urls = [
+            "https://api.coindesk.com",
+            "https://data-api.coindesk.com"
+        ]
+        # 会话、缓存、令牌桶在同类实例间共享（见 _init_shared）
+        cls = self._init_shared()
+        self.session = cls._SESSION
+        self._cache = cls._CACHE
+        self._bucket = cls._BUCKET
     
-    def _make_request(self, url: str, params: Optional[Dict] = None) -> Dict:
+    @classmethod
+    def _init_shared(cls) -> type:
+        """
+        懒加载类级共享的会话、缓存和令牌桶
+        
+        多个实例同时存在时共用同一个连接池和响应缓存；令牌桶共享后，
+        限流额度按进程统计，而不是每个实例各算一份。
+        """
+        with cls._SHARED_LOCK:
+            if cls._SESSION is None:
+                cls._SESSION = build_session(headers={
+                    "User-Agent": "StockAnalysisBot/1.0",
+                    "Accept": "application/json"
+                })
+                # 短期响应缓存：同一批次内重复请求直接命中，减轻限流压力
+                cls._CACHE = TTLCache(maxsize=512, ttl=30)
+                # 客户端令牌桶：免费版约30次/分钟，提前排队而不是等服务端返回429
+                cls._BUCKET = TokenBucket(capacity=30, refill_rate=0.5)
+        return cls
+    
+    def close(self) -> None:
+        """关闭共享HTTP会话，释放连接池（之后新建的实例会重新创建会话）"""
+        cls = type(self)
+        with cls._SHARED_LOCK:
+            if cls._SESSION is self.session:
+                cls._SESSION = None
+        self.session.close()
+    
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=1, max=30),
+        retry=retry_if_exception_type(RateLimitError),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    def _make_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        cache_ttl: Optional[int] = None
+    ) -> Dict:
         """
         发起API请求
         
         Args:
-            url: API端点URL
+            endpoint: API端点路径（如 index/cc/v1/latest/tick）
             params: 查询参数
+            cache_ttl: 响应缓存有效期（秒），默认30秒，0表示不缓存
             
         Returns:
             API响应数据
         """
-        try:
-            response = self.session.get(url, params=params, timeout=10)
+        endpoint = endpoint.lstrip('/')
+        
+        cache_key = make_cache_key(endpoint, params)
+        if cache_ttl != 0:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"[缓存命中] {self.name} {endpoint} (命中 {self._cache.hits} / 未命中 {self._cache.misses})")
+                return cached
+        
+        last_error: Optional[Exception] = None
+        metric_endpoint = endpoint
+        for base_url in self.fallback_base_urls:
+            url = f"{base_url}/{endpoint}"
+            
+            self._bucket.acquire()
+            
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=10)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    requests.exceptions.RetryError) as e:
+                record_request(self.name, metric_endpoint, "error", time.perf_counter() - start)
+                last_error = e
+                logger.debug(f"[{self.name}] {base_url} 请求失败，尝试下一个主机: {e}")
+                continue
+            except requests.exceptions.RequestException as e:
+                record_request(self.name, metric_endpoint, "error", time.perf_counter() - start)
+                raise DataFetchError(f"Coindesk API请求失败: {str(e)}")
+            
+            record_request(self.name, metric_endpoint, response.status_code, time.perf_counter() - start)
             
             if response.status_code == 429:
+                self._bucket.on_throttle()
+                # 遵循服务端建议的等待时间后再交给重试逻辑
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after:
+                    time.sleep(retry_after)
                 raise RateLimitError("Coindesk API请求频率超限")
             
-            response.raise_for_status()
-            return response.json()
+            if response.status_code >= 500:
+                last_error = DataFetchError(f"HTTP {response.status_code}")
+                logger.debug(f"[{self.name}] {base_url} 返回 {response.status_code}，尝试下一个主机")
+                continue
+            
+            try:
+                response.raise_for_status()
+                data = loads_json(response.content)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise DataFetchError(f"Coindesk API请求失败: {str(e)}")
             
-        except requests.exceptions.RequestException as e:
-            raise DataFetchError(f"Coindesk API请求失败: {str(e)}")
+            self._bucket.on_success()
+            logger.debug(f"[{self.name}] {endpoint} 由 {base_url} 响应")
+            break
+        else:
+            raise DataFetchError(f"Coindesk API请求失败（所有主机均不可用）: {last_error}")
+        
+        if cache_ttl != 0:
+            self._cache.set(cache_key, data, ttl=cache_ttl)
+        return data
     
-    def get_crypto_price(self, symbol: str) -> Optional[Dict[str, Any]]:
+    def get_crypto_price(self, symbol: str) -> Optional[CryptoQuote]:
         """
         获取加密货币实时价格（Index CC API）
         
@@ -88,22 +218,13 @@ class CoindeskFetcher(BaseFetcher):
             symbol: 货币符号（如 BTC, ETH）
             
         Returns:
-            价格数据字典
+            CryptoQuote（需要字典时调用 to_dict()）
         """
         try:
             # Coindesk Index CC API endpoint
-            url = "https://api.coindesk.com/index/cc/v1/latest/tick"
-            
-            # 符号映射
-            symbol_map = {
-                'BTC': 'XBT',
-                'ETH': 'ETH',
-                'BCH': 'BCH',
-                'LTC': 'LTC',
-                'XRP': 'XRP'
-            }
+            endpoint = "index/cc/v1/latest/tick"
             
-            coindesk_symbol = symbol_map.get(symbol.upper())
+            coindesk_symbol = _COINDESK_SYMBOLS.get(symbol.upper())
             if not coindesk_symbol:
                 logger.warning(f"[{self.name}] 不支持的货币: {symbol}")
                 return None
@@ -113,7 +234,7 @@ class CoindeskFetcher(BaseFetcher):
                 "precision": "2"
             }
             
-            data = self._make_request(url, params)
+            data = self._make_request(endpoint, params)
             
             if not data or "data" not in data:
                 return None
@@ -122,24 +243,49 @@ class CoindeskFetcher(BaseFetcher):
             index_data = tick_data.get("index", {})
             ohlc_data = tick_data.get("ohlc", {})
             
-            return {
-                "symbol": symbol.upper(),
-                "name": f"{symbol.upper()}/USD",
-                "price": float(index_data.get("value", 0)),
-                "price_change_24h": float(ohlc_data.get("change24h", 0)),
-                "price_change_percentage_24h": float(ohlc_data.get("changepct24h", 0)),
-                "open_24h": float(ohlc_data.get("open24h", 0)),
-                "high_24h": float(ohlc_data.get("high24h", 0)),
-                "low_24h": float(ohlc_data.get("low24h", 0)),
-                "volume_24h": float(ohlc_data.get("volume24h", 0)),
-                "timestamp": int(datetime.now().timestamp()),
-                "source": "Coindesk Index CC"
-            }
+            return CryptoQuote(
+                symbol=symbol.upper(),
+                name=f"{symbol.upper()}/USD",
+                price=float(index_data.get("value", 0)),
+                price_change_24h=float(ohlc_data.get("change24h", 0)),
+                price_change_percentage_24h=float(ohlc_data.get("changepct24h", 0)),
+                open_24h=float(ohlc_data.get("open24h", 0)),
+                high_24h=float(ohlc_data.get("high24h", 0)),
+                low_24h=float(ohlc_data.get("low24h", 0)),
+                volume_24h=float(ohlc_data.get("volume24h", 0)),
+                timestamp=int(time.time()),
+                source="Coindesk Index CC"
+            )
             
         except Exception as e:
             logger.warning(f"[{self.name}] 获取价格失败 {symbol}: {e}")
             return None
     
+    def get_crypto_prices(
+        self,
+        symbols: List[str],
+        max_workers: int = 8
+    ) -> List[Optional[CryptoQuote]]:
+        """
+        并发获取多个货币的实时价格
+        
+        各币种请求相互独立，在线程池中并发执行（总耗时≈最慢的单次请求）。
+        并发数有上限，批量回填大量币种时线程数和连接数都保持可控。
+        
+        Args:
+            symbols: 货币符号列表
+            max_workers: 最大并发数
+            
+        Returns:
+            与 symbols 顺序一致的 CryptoQuote 列表（获取失败的位置为 None）
+        """
+        if not symbols:
+            return []
+        
+        workers = max(1, min(max_workers, len(symbols)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.get_crypto_price, symbols))
+    
     def get_news_list(
         self,
         limit: int = 20,
@@ -157,7 +303,7 @@ class CoindeskFetcher(BaseFetcher):
         """
         try:
             # Coindesk News API endpoint
-            url = "https://api.coindesk.com/news/v1/article/list"
+            endpoint = "news/v1/article/list"
             
             params = {
                 "limit": limit,
@@ -167,7 +313,7 @@ class CoindeskFetcher(BaseFetcher):
             # 移除None值
             params = {k: v for k, v in params.items() if v is not None}
             
-            data = self._make_request(url, params)
+            data = self._make_request(endpoint, params, cache_ttl=300)
             
             if not data or "data" not in data:
                 return None
@@ -205,17 +351,16 @@ class CoindeskFetcher(BaseFetcher):
             major_coins = ["BTC", "ETH", "BCH", "LTC", "XRP"]
             results = []
             
-            for symbol in major_coins:
-                price_data = self.get_crypto_price(symbol)
+            for price_data in self.get_crypto_prices(major_coins):
                 if price_data:
                     results.append({
-                        "symbol": price_data["symbol"],
-                        "name": price_data["name"],
-                        "price": price_data["price"],
-                        "change_24h": price_data["price_change_24h"],
-                        "change_percent_24h": price_data["price_change_percentage_24h"],
-                        "volume_24h": price_data["volume_24h"],
-                        "timestamp": price_data["timestamp"]
+                        "symbol": price_data.symbol,
+                        "name": price_data.name,
+                        "price": price_data.price,
+                        "change_24h": price_data.price_change_24h,
+                        "change_percent_24h": price_data.price_change_percentage_24h,
+                        "volume_24h": price_data.volume_24h,
+                        "timestamp": price_data.timestamp
                     })
             
             return results if results else None
@@ -259,11 +404,8 @@ class CoindeskFetcher(BaseFetcher):
     
     def _normalize_data(self, df: pd.DataFrame, stock_code: str) -> pd.DataFrame:
         """标准化数据列名"""
-        required_columns = ["date", "open", "high", "low", "close", "volume", "amount", "pct_chg"]
-        for col in required_columns:
-            if col not in df.columns:
-                df[col] = 0.0
-        return df[required_columns]
+        # 一次 reindex 完成列选择与缺失列补0，避免逐列插入
+        return df.reindex(columns=STANDARD_COLUMNS, fill_value=0.0)
     
     def get_main_indices(self) -> Optional[List[Dict[str, Any]]]:
         """获取主要市场指数"""
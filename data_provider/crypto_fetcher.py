@@ -21,18 +21,129 @@
 
 import logging
 import os
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+import threading
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Tuple, Union
+from datetime import date, datetime
 
 import requests
+import numpy as np
 import pandas as pd
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_random_exponential,
+    retry_if_exception_type,
+    before_sleep_log,
+)
 
-from data_provider.base import BaseFetcher, DataFetchError, RateLimitError
+from data_provider.base import STANDARD_COLUMNS, BaseFetcher, DataFetchError, RateLimitError
+from data_provider.http_utils import (
+    FileCache,
+    TTLCache,
+    TokenBucket,
+    build_session,
+    loads_json,
+    make_cache_key,
+    parse_retry_after,
+    record_request,
+)
+from data_provider.realtime_types import CryptoQuote
 
 logger = logging.getLogger(__name__)
 
 
+# CoinGecko使用ID而非符号
+_COINGECKO_IDS = MappingProxyType({
+    'btc': 'bitcoin',
+    'eth': 'ethereum',
+    'bnb': 'binancecoin',
+    'sol': 'solana',
+    'xrp': 'ripple',
+    'ada': 'cardano',
+    'doge': 'dogecoin',
+    'dot': 'polkadot',
+    'matic': 'matic-network',
+    'ltc': 'litecoin',
+    'trx': 'tron',
+    'avax': 'avalanche-2',
+    'shib': 'shiba-inu',
+    'uni': 'uniswap',
+    'link': 'chainlink'
+})
+
+# 批量报价接口不返回名称，使用本地名称表
+_COINGECKO_NAMES = MappingProxyType({
+    'bitcoin': 'Bitcoin',
+    'ethereum': 'Ethereum',
+    'binancecoin': 'BNB',
+    'solana': 'Solana',
+    'ripple': 'XRP',
+    'cardano': 'Cardano',
+    'dogecoin': 'Dogecoin',
+    'polkadot': 'Polkadot',
+    'matic-network': 'Polygon',
+    'litecoin': 'Litecoin',
+    'tron': 'TRON',
+    'avalanche-2': 'Avalanche',
+    'shiba-inu': 'Shiba Inu',
+    'uniswap': 'Uniswap',
+    'chainlink': 'Chainlink'
+})
+
+
+# /coins/{id} 响应中 market_data 下的字段路径：(输出字段, 路径)
+# 模块加载时确定一次，每条响应按表取值，不再逐个链式 .get()
+_QUOTE_FIELDS = (
+    ("price", ("current_price", "usd")),
+    ("price_change_24h", ("price_change_24h",)),
+    ("price_change_percentage_24h", ("price_change_percentage_24h",)),
+    ("market_cap", ("market_cap", "usd")),
+    ("volume_24h", ("total_volume", "usd")),
+    ("high_24h", ("high_24h", "usd")),
+    ("low_24h", ("low_24h", "usd")),
+    ("circulating_supply", ("circulating_supply",)),
+    ("total_supply", ("total_supply",)),
+)
+
+
+def _extract_fields(data: Dict[str, Any], fields: tuple, default: Any = 0) -> Dict[str, Any]:
+    """按字段路径表从嵌套 JSON 中取值，路径缺失时使用 default"""
+    result = {}
+    for name, path in fields:
+        value = data
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                value = default
+                break
+            value = value[key]
+        result[name] = value
+    return result
+
+
+# coins/ 下的固定端点，其余 coins/<id>... 均为按币种区分的端点
+_COINS_STATIC_ENDPOINTS = frozenset({"markets", "list", "categories"})
+
+
+def _metric_endpoint(endpoint: str) -> str:
+    """将端点路径中的币种ID替换为占位符，作为指标标签（coins/bitcoin/market_chart -> coins/{id}/market_chart）"""
+    parts = endpoint.split("/")
+    if len(parts) >= 2 and parts[0] == "coins" and parts[1] not in _COINS_STATIC_ENDPOINTS:
+        parts[1] = "{id}"
+    return "/".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def _market_chart_request(coin_id: str, days: int) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """历史K线请求的端点和参数（按币种/天数缓存，回测批量回填时不再重复拼接）"""
+    return (
+        f"coins/{coin_id}/market_chart",
+        (("vs_currency", "usd"), ("days", str(days)), ("interval", "daily"))
+    )
+
+
 class CryptoFetcher(BaseFetcher):
     """
     虚拟货币数据获取器
@@ -47,6 +158,15 @@ class CryptoFetcher(BaseFetcher):
     name = "Crypto"
     priority = 1  # 最高优先级（虚拟货币专用）
     
+    # 主要行情展示的币种
+    MAIN_SYMBOLS = ('btc', 'eth', 'bnb', 'sol', 'xrp')
+    
+    # 类级共享资源（首次实例化时创建）
+    _SESSION: Optional[requests.Session] = None
+    _CACHE: Optional[TTLCache] = None
+    _BUCKET: Optional[TokenBucket] = None
+    _SHARED_LOCK = threading.Lock()
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         初始化
@@ -56,35 +176,138 @@ class CryptoFetcher(BaseFetcher):
         """
         self.api_key = api_key or os.getenv("CRYPTO_API_KEY")
         self.base_url = "https://api.coingecko.com/api/v3"
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "StockAnalysisBot/1.0",
-            "Accept": "application/json"
-        })
+        # 按顺序尝试的API主机：主机返回5xx或连接失败时切换到下一个
+        self.fallback_base_urls = [
+            self.base_url,
+            "https://pro-api.coingecko.com/api/v3"
+        ]
+        # 会话、缓存、令牌桶在同类实例间共享（见 _init_shared）
+        cls = self._init_shared()
+        self.session = cls._SESSION
+        self._cache = cls._CACHE
+        self._bucket = cls._BUCKET
+        # 历史K线磁盘缓存：已收盘的数据不会变化，跨运行复用
+        cache_dir = os.getenv("DATA_CACHE_DIR", ".cache")
+        self._disk = FileCache(os.path.join(cache_dir, "crypto_fetcher"), ttl=86400)
     
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """发起API请求"""
-        if params is None:
-            params = {}
+    @classmethod
+    def _init_shared(cls) -> type:
+        """
+        懒加载类级共享的会话、缓存和令牌桶
         
-        if self.api_key:
-            params["x_cg_demo_api_key"] = self.api_key
+        多个实例同时存在时共用同一个连接池和响应缓存；令牌桶共享后，
+        限流额度按进程统计，而不是每个实例各算一份。
+        """
+        with cls._SHARED_LOCK:
+            if cls._SESSION is None:
+                cls._SESSION = build_session(headers={
+                    "User-Agent": "StockAnalysisBot/1.0",
+                    "Accept": "application/json"
+                })
+                # 短期响应缓存：同一批次内重复请求直接命中，减轻限流压力
+                cls._CACHE = TTLCache(maxsize=512, ttl=30)
+                # 客户端令牌桶：免费版约30次/分钟，提前排队而不是等服务端返回429
+                cls._BUCKET = TokenBucket(capacity=30, refill_rate=0.5)
+        return cls
+    
+    def close(self) -> None:
+        """关闭共享HTTP会话，释放连接池（之后新建的实例会重新创建会话）"""
+        cls = type(self)
+        with cls._SHARED_LOCK:
+            if cls._SESSION is self.session:
+                cls._SESSION = None
+        self.session.close()
+    
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=1, max=30),
+        retry=retry_if_exception_type(RateLimitError),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    def _make_request(
+        self,
+        endpoint: str,
+        params: Optional[Union[Dict, Tuple[Tuple[str, Any], ...]]] = None,
+        cache_ttl: Optional[int] = None
+    ) -> Dict:
+        """
+        发起API请求
         
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        Args:
+            endpoint: API端点
+            params: 查询参数（字典或键值对元组）
+            cache_ttl: 响应缓存有效期（秒），默认30秒，0表示不缓存
+        """
+        params = dict(params) if params else {}
+        endpoint = endpoint.lstrip('/')
         
-        try:
-            response = self.session.get(url, params=params, timeout=10)
+        cache_key = make_cache_key(endpoint, params)
+        if cache_ttl != 0:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"[缓存命中] {self.name} {endpoint} (命中 {self._cache.hits} / 未命中 {self._cache.misses})")
+                return cached
+        
+        last_error: Optional[Exception] = None
+        metric_endpoint = _metric_endpoint(endpoint)
+        for base_url in self.fallback_base_urls:
+            url = f"{base_url}/{endpoint}"
+            
+            request_params = dict(params)
+            if self.api_key:
+                # Pro主机与Demo主机使用不同的密钥参数名
+                key_param = "x_cg_pro_api_key" if "pro-api" in base_url else "x_cg_demo_api_key"
+                request_params[key_param] = self.api_key
+            
+            self._bucket.acquire()
+            
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=request_params, timeout=10)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    requests.exceptions.RetryError) as e:
+                record_request(self.name, metric_endpoint, "error", time.perf_counter() - start)
+                last_error = e
+                logger.debug(f"[{self.name}] {base_url} 请求失败，尝试下一个主机: {e}")
+                continue
+            except requests.exceptions.RequestException as e:
+                record_request(self.name, metric_endpoint, "error", time.perf_counter() - start)
+                raise DataFetchError(f"CoinGecko API请求失败: {str(e)}")
+            
+            record_request(self.name, metric_endpoint, response.status_code, time.perf_counter() - start)
             
             if response.status_code == 429:
+                self._bucket.on_throttle()
+                # 遵循服务端建议的等待时间后再交给重试逻辑
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after:
+                    time.sleep(retry_after)
                 raise RateLimitError("CoinGecko API请求频率超限")
             
-            response.raise_for_status()
-            return response.json()
+            if response.status_code >= 500:
+                last_error = DataFetchError(f"HTTP {response.status_code}")
+                logger.debug(f"[{self.name}] {base_url} 返回 {response.status_code}，尝试下一个主机")
+                continue
             
-        except requests.exceptions.RequestException as e:
-            raise DataFetchError(f"CoinGecko API请求失败: {str(e)}")
+            try:
+                response.raise_for_status()
+                data = loads_json(response.content)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise DataFetchError(f"CoinGecko API请求失败: {str(e)}")
+            
+            self._bucket.on_success()
+            logger.debug(f"[{self.name}] {endpoint} 由 {base_url} 响应")
+            break
+        else:
+            raise DataFetchError(f"CoinGecko API请求失败（所有主机均不可用）: {last_error}")
+        
+        if cache_ttl != 0:
+            self._cache.set(cache_key, data, ttl=cache_ttl)
+        return data
     
-    def get_crypto_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+    def get_crypto_quote(self, symbol: str) -> Optional[CryptoQuote]:
         """
         获取加密货币实时报价
         
@@ -92,8 +315,9 @@ class CryptoFetcher(BaseFetcher):
             symbol: 货币符号（如 btc, eth, sol）
             
         Returns:
+            CryptoQuote（需要字典时调用 to_dict()），例如：
             {
-                'symbol': 'btc',
+                'symbol': 'BTC',
                 'name': 'Bitcoin',
                 'price': 43250.50,
                 'price_change_24h': 1250.30,
@@ -108,53 +332,94 @@ class CryptoFetcher(BaseFetcher):
             }
         """
         try:
-            # CoinGecko使用ID而非符号
-            coin_ids = {
-                'btc': 'bitcoin',
-                'eth': 'ethereum',
-                'bnb': 'binancecoin',
-                'sol': 'solana',
-                'xrp': 'ripple',
-                'ada': 'cardano',
-                'doge': 'dogecoin',
-                'dot': 'polkadot',
-                'matic': 'matic-network',
-                'ltc': 'litecoin',
-                'trx': 'tron',
-                'avax': 'avalanche-2',
-                'shib': 'shiba-inu',
-                'uni': 'uniswap',
-                'link': 'chainlink'
-            }
-            
-            coin_id = coin_ids.get(symbol.lower())
+            coin_id = _COINGECKO_IDS.get(symbol.lower())
             if not coin_id:
                 logger.warning(f"[{self.name}] 不支持的货币: {symbol}")
                 return None
             
-            data = self._make_request(f"coins/{coin_id}")
+            # 只保留行情字段，去掉本地化、交易对、社区和开发者数据（响应体缩小约10倍）
+            data = self._make_request(f"coins/{coin_id}", {
+                "localization": "false",
+                "tickers": "false",
+                "market_data": "true",
+                "community_data": "false",
+                "developer_data": "false",
+                "sparkline": "false"
+            })
             
-            market_data = data.get("market_data", {})
-            return {
-                "symbol": symbol.upper(),
-                "name": data.get("name", ""),
-                "price": market_data.get("current_price", {}).get("usd", 0),
-                "price_change_24h": market_data.get("price_change_24h", 0),
-                "price_change_percentage_24h": market_data.get("price_change_percentage_24h", 0),
-                "market_cap": market_data.get("market_cap", {}).get("usd", 0),
-                "volume_24h": market_data.get("total_volume", {}).get("usd", 0),
-                "high_24h": market_data.get("high_24h", {}).get("usd", 0),
-                "low_24h": market_data.get("low_24h", {}).get("usd", 0),
-                "circulating_supply": market_data.get("circulating_supply", 0),
-                "total_supply": market_data.get("total_supply", 0),
-                "timestamp": int(datetime.now().timestamp())
-            }
+            return CryptoQuote(
+                symbol=symbol.upper(),
+                name=data.get("name", ""),
+                timestamp=int(time.time()),
+                **_extract_fields(data.get("market_data") or {}, _QUOTE_FIELDS)
+            )
             
         except Exception as e:
             logger.warning(f"[{self.name}] 获取报价失败 {symbol}: {e}")
             return None
     
-    def get_top_coins(self, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+    def get_crypto_quotes(self, symbols: List[str]) -> Optional[List[CryptoQuote]]:
+        """
+        批量获取加密货币报价（/simple/price，一次请求返回多个币种）
+        
+        Args:
+            symbols: 货币符号列表（如 ['btc', 'eth']）
+            
+        Returns:
+            CryptoQuote 列表（顺序与输入一致，不支持的币种被跳过），字段：
+            symbol, name, price, price_change_24h, price_change_percentage_24h,
+            market_cap, volume_24h, timestamp
+        """
+        try:
+            pairs = []
+            for symbol in symbols:
+                coin_id = _COINGECKO_IDS.get(symbol.lower())
+                if coin_id:
+                    pairs.append((symbol, coin_id))
+                else:
+                    logger.warning(f"[{self.name}] 不支持的货币: {symbol}")
+            
+            if not pairs:
+                return None
+            
+            data = self._make_request("simple/price", {
+                "ids": ",".join(coin_id for _, coin_id in pairs),
+                "vs_currencies": "usd",
+                "include_market_cap": "true",
+                "include_24hr_vol": "true",
+                "include_24hr_change": "true",
+                "include_last_updated_at": "true"
+            })
+            
+            results = []
+            for symbol, coin_id in pairs:
+                coin = data.get(coin_id)
+                if not coin:
+                    continue
+                
+                price = coin.get("usd", 0) or 0
+                change_pct = coin.get("usd_24h_change", 0) or 0
+                # 接口只返回涨跌幅，按当前价反推24小时涨跌额
+                change = price * change_pct / (100 + change_pct) if change_pct > -100 else 0
+                
+                results.append(CryptoQuote(
+                    symbol=symbol.upper(),
+                    name=_COINGECKO_NAMES.get(coin_id, coin_id),
+                    price=price,
+                    price_change_24h=change,
+                    price_change_percentage_24h=change_pct,
+                    market_cap=coin.get("usd_market_cap", 0),
+                    volume_24h=coin.get("usd_24h_vol", 0),
+                    timestamp=coin.get("last_updated_at") or int(time.time())
+                ))
+            
+            return results
+            
+        except Exception as e:
+            logger.warning(f"[{self.name}] 批量获取报价失败 {symbols}: {e}")
+            return None
+    
+    def get_top_coins(self, limit: int = 20) -> Optional[List[CryptoQuote]]:
         """
         获取市值排名前N的加密货币
         
@@ -162,7 +427,7 @@ class CryptoFetcher(BaseFetcher):
             limit: 返回数量
             
         Returns:
-            加密货币列表
+            CryptoQuote 列表（含 rank 字段）
         """
         try:
             data = self._make_request("coins/markets", {
@@ -171,21 +436,20 @@ class CryptoFetcher(BaseFetcher):
                 "per_page": limit,
                 "page": 1,
                 "sparkline": False
-            })
+            }, cache_ttl=60)
             
-            results = []
-            for coin in data:
-                results.append({
-                    "symbol": coin.get("symbol", "").upper(),
-                    "name": coin.get("name", ""),
-                    "price": coin.get("current_price", 0),
-                    "price_change_percentage_24h": coin.get("price_change_percentage_24h", 0),
-                    "market_cap": coin.get("market_cap", 0),
-                    "volume_24h": coin.get("total_volume", 0),
-                    "rank": coin.get("market_cap_rank", 0)
-                })
-            
-            return results
+            return [
+                CryptoQuote(
+                    symbol=coin.get("symbol", "").upper(),
+                    name=coin.get("name", ""),
+                    price=coin.get("current_price", 0),
+                    price_change_percentage_24h=coin.get("price_change_percentage_24h", 0),
+                    market_cap=coin.get("market_cap", 0),
+                    volume_24h=coin.get("total_volume", 0),
+                    rank=coin.get("market_cap_rank", 0)
+                )
+                for coin in data
+            ]
             
         except Exception as e:
             logger.warning(f"[{self.name}] 获取Top Coins失败: {e}")
@@ -207,57 +471,49 @@ class CryptoFetcher(BaseFetcher):
             DataFrame包含日期、开盘、最高、最低、收盘、交易量
         """
         try:
-            coin_ids = {
-                'btc': 'bitcoin',
-                'eth': 'ethereum',
-                'sol': 'solana'
-            }
-            
-            coin_id = coin_ids.get(symbol.lower())
+            coin_id = _COINGECKO_IDS.get(symbol.lower())
             if not coin_id:
+                logger.warning(f"[{self.name}] 不支持的货币: {symbol}")
                 return None
             
-            data = self._make_request(f"coins/{coin_id}/market_chart", {
-                "vs_currency": "usd",
-                "days": days,
-                "interval": "daily"
-            })
+            # 历史部分按自然日缓存到磁盘，当天内只下载一次
+            cache_key = f"{coin_id}:{days}:{date.today().isoformat()}"
+            data = self._disk.get(cache_key, namespace="market_chart")
+            if data is None:
+                endpoint, params = _market_chart_request(coin_id, days)
+                data = self._make_request(endpoint, params)
+                self._disk.set(cache_key, data, namespace="market_chart")
+            else:
+                # 最后一个点是实时价格，单独刷新（走30秒内存缓存的批量报价接口）
+                self._refresh_latest_point(symbol, data)
             
             prices = data.get("prices", [])
-            market_caps = data.get("market_caps", [])
             volumes = data.get("total_volumes", [])
             
             if not prices:
                 return None
             
-            records = []
-            for i, price_data in enumerate(prices):
-                timestamp, price = price_data
-                date = datetime.fromtimestamp(timestamp/1000).strftime("%Y-%m-%d")
-                
-                # 简化处理：使用收盘价作为OHLC（实际应获取完整K线）
-                close = price
-                high = close * 1.02  # 估算
-                low = close * 0.98   # 估算
-                open_price = close * 0.99  # 估算
-                
-                volume = volumes[i][1] if i < len(volumes) else 0
-                
-                records.append({
-                    "date": date,
-                    "open": open_price,
-                    "high": high,
-                    "low": low,
-                    "close": close,
-                    "volume": volume,
-                    "amount": close * volume
-                })
+            # [[timestamp_ms, value], ...] -> N x 2 数组，按列向量化计算
+            price_arr = np.asarray(prices, dtype=np.float64).reshape(-1, 2)
+            closes = price_arr[:, 1]
             
-            df = pd.DataFrame(records)
-            if len(df) > 1:
-                df["pct_chg"] = df["close"].pct_change() * 100
-            else:
-                df["pct_chg"] = 0.0
+            # 成交量与价格按位置对齐，缺失部分补0
+            vols = np.zeros_like(closes)
+            if volumes:
+                vol_arr = np.asarray(volumes, dtype=np.float64).reshape(-1, 2)[:len(closes), 1]
+                vols[:len(vol_arr)] = vol_arr
+            
+            # 简化处理：使用收盘价估算OHLC（实际应获取完整K线）
+            df = pd.DataFrame({
+                "date": pd.to_datetime(price_arr[:, 0], unit="ms", utc=True).strftime("%Y-%m-%d"),
+                "open": closes * 0.99,
+                "high": closes * 1.02,
+                "low": closes * 0.98,
+                "close": closes,
+                "volume": vols,
+                "amount": closes * vols
+            })
+            df["pct_chg"] = df["close"].pct_change().mul(100).fillna(0.0)
             
             return df
             
@@ -265,6 +521,22 @@ class CryptoFetcher(BaseFetcher):
             logger.warning(f"[{self.name}] 获取历史数据失败 {symbol}: {e}")
             return None
     
+    def _refresh_latest_point(self, symbol: str, data: Dict[str, Any]) -> None:
+        """用实时报价覆盖缓存历史数据中的最新价格点（失败时保留缓存值）"""
+        prices = data.get("prices")
+        if not prices:
+            return
+        
+        quotes = self.get_crypto_quotes([symbol])
+        if not quotes:
+            return
+        
+        quote = quotes[0]
+        prices[-1][1] = quote.price
+        volumes = data.get("total_volumes")
+        if volumes and len(volumes) == len(prices):
+            volumes[-1][1] = quote.volume_24h
+    
     def _fetch_raw_data(self, stock_code: str, start_date: str, end_date: str) -> pd.DataFrame:
         """获取历史数据（适配BaseFetcher接口）"""
         days = (datetime.strptime(end_date, "%Y-%m-%d") - 
@@ -273,28 +545,25 @@ class CryptoFetcher(BaseFetcher):
     
     def _normalize_data(self, df: pd.DataFrame, stock_code: str) -> pd.DataFrame:
         """标准化数据列名"""
-        required_columns = ["date", "open", "high", "low", "close", "volume", "amount", "pct_chg"]
-        for col in required_columns:
-            if col not in df.columns:
-                df[col] = 0.0
-        return df[required_columns]
+        # 一次 reindex 完成列选择与缺失列补0，避免逐列插入
+        return df.reindex(columns=STANDARD_COLUMNS, fill_value=0.0)
     
     def get_main_indices(self) -> Optional[List[Dict[str, Any]]]:
         """获取主要加密货币行情"""
-        top_coins = self.get_top_coins(10)
-        if not top_coins:
+        quotes = self.get_crypto_quotes(self.MAIN_SYMBOLS)
+        if not quotes:
             return None
         
         results = []
-        for coin in top_coins[:5]:  # 取前5
+        for quote in quotes:
             results.append({
-                "symbol": coin["symbol"],
-                "name": coin["name"],
-                "price": coin["price"],
-                "change": coin["price_change_percentage_24h"],
-                "change_percent": coin["price_change_percentage_24h"],
-                "volume": coin["volume_24h"],
-                "timestamp": int(datetime.now().timestamp())
+                "symbol": quote.symbol,
+                "name": quote.name,
+                "price": quote.price,
+                "change": quote.price_change_24h,
+                "change_percent": quote.price_change_percentage_24h,
+                "volume": quote.volume_24h,
+                "timestamp": quote.timestamp
             })
         
         return results
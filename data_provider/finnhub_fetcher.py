@@ -16,19 +16,86 @@ API文档：https://finnhub.io/docs/api
 
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
 
 import requests
+import numpy as np
 import pandas as pd
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from data_provider.base import BaseFetcher, DataFetchError, RateLimitError
+from data_provider.http_utils import (
+    AIMDConcurrency,
+    FileCache,
+    RateLimitWindowMixin,
+    TokenBucket,
+    backoff_delay,
+    close_shared_session,
+    get_shared_session,
+    loads_json,
+    parse_retry_after,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class FinnhubFetcher(BaseFetcher):
+# 各端点的磁盘缓存有效期（秒），按数据更新频率设置；未列出的端点不缓存
+_CACHE_TTLS = {
+    "quote": 60,
+    "stock/profile2": 30 * 86400,
+    "stock/metric": 7 * 86400,
+    "stock/candle": 86400,  # 日线；分钟线缩短为一个K线粒度
+    "company-news": 3600,
+}
+
+# K线响应字段 -> DataFrame 列
+_CANDLE_COLUMNS = (
+    ("open", "o"),
+    ("high", "h"),
+    ("low", "l"),
+    ("close", "c"),
+    ("volume", "v"),
+)
+
+# 网络错误/限流时的最大尝试次数
+_MAX_ATTEMPTS = 3
+
+
+def _candle_bucket(resolution: str) -> int:
+    """K线粒度对应的秒数：分钟线为分钟数 * 60，日/周/月线按天"""
+    return int(resolution) * 60 if resolution.isdigit() else 86400
+
+
+# A股代码首位 -> 交易所后缀
+_SUFFIX_BY_PREFIX = {
+    "6": ".SS",  # 上海证券交易所
+    "5": ".SS",
+    "0": ".SZ",  # 深圳证券交易所
+    "3": ".SZ",
+}
+
+
+@lru_cache(maxsize=4096)
+def _to_finnhub_symbol(stock_code: str) -> str:
+    """股票代码 -> Finnhub 代码（查表 + 缓存，批量处理时每个代码只解析一次）"""
+    if stock_code.isdigit():
+        # A股: 600519 -> 600519.SS (上海) 或 000001 -> 000001.SZ (深圳)
+        if len(stock_code) == 6:
+            suffix = _SUFFIX_BY_PREFIX.get(stock_code[0])
+            if suffix:
+                return stock_code + suffix
+        # 港股: 00700 -> 00700.HK
+        elif len(stock_code) == 5:
+            return stock_code + ".HK"
+    # 美股: AAPL -> AAPL (保持不变)，已带后缀的代码原样返回
+    return stock_code.upper()
+
+
+class FinnhubFetcher(RateLimitWindowMixin, BaseFetcher):
     """
     Finnhub数据获取器
     
@@ -54,11 +121,35 @@ class FinnhubFetcher(BaseFetcher):
             raise ValueError("Finnhub API密钥未配置，请设置FINNHUB_API_KEY环境变量")
         
         self.base_url = "https://finnhub.io/api/v1"
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "StockAnalysisBot/1.0",
-            "Accept": "application/json"
-        })
+        # 进程级共享会话：调大连接池并保持长连接，多个实例复用已建立的 TLS 连接
+        self.session = get_shared_session(
+            self.base_url,
+            headers={
+                "User-Agent": "StockAnalysisBot/1.0",
+                "Accept": "application/json"
+            },
+            pool_connections=20,
+            pool_maxsize=50
+        )
+        # 响应磁盘缓存：公司信息、财务指标等低频数据跨运行复用；过期文件由 FileCache 定期清理
+        cache_dir = os.getenv("DATA_CACHE_DIR", ".cache")
+        self._disk = FileCache(os.path.join(cache_dir, "finnhub"))
+        # 客户端令牌桶：免费版60次/分钟
+        self._bucket = TokenBucket(capacity=60, refill_rate=1.0)
+        # 严格的每分钟上限，并根据 X-Ratelimit-* 响应头提前暂停
+        self._init_rate_window(limit=60, window=60.0)
+        # 批量并发请求的自适应并发数（get_main_indices 等）
+        self._concurrency = AIMDConcurrency(initial=4, min_limit=1, max_limit=16)
+    
+    def close(self) -> None:
+        """关闭共享HTTP会话，释放连接池（之后新建的实例会重新创建会话）"""
+        close_shared_session(self.base_url)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """
@@ -75,30 +166,69 @@ class FinnhubFetcher(BaseFetcher):
             RateLimitError: 请求频率超限
             DataFetchError: 其他API错误
         """
-        if params is None:
-            params = {}
+        endpoint = endpoint.lstrip('/')
+        params = dict(params) if params else {}
+        
+        # 缓存键不含 token，更换密钥后缓存仍然有效
+        cache_ttl = _CACHE_TTLS.get(endpoint)
+        if cache_ttl and endpoint == "stock/candle":
+            # 分钟线的请求窗口随粒度滚动，缓存只保留一个粒度，过期文件由磁盘缓存定期清理
+            cache_ttl = min(cache_ttl, _candle_bucket(str(params.get("resolution", "D"))))
+        cache_key = f"{endpoint}?{urlencode(sorted(params.items()))}"
+        if cache_ttl:
+            cached = self._disk.get(cache_key, namespace=endpoint)
+            if cached is not None:
+                logger.debug(f"[{self.name}] 磁盘缓存命中 {endpoint}")
+                return cached
         
         params["token"] = self.api_key
         
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        url = f"{self.base_url}/{endpoint}"
         
-        try:
-            response = self.session.get(url, params=params, timeout=10)
+        for attempt in range(_MAX_ATTEMPTS):
+            # 按免费版额度提前排队，避免必然返回429的请求
+            self._bucket.acquire()
+            self._rate_window_wait()
+            
+            try:
+                response = self.session.get(url, params=params, timeout=10)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise DataFetchError(f"Finnhub API请求失败: {str(e)}")
+                delay = backoff_delay(attempt)
+                logger.debug(f"[{self.name}] {endpoint} 网络错误，{delay:.1f} 秒后重试: {e}")
+                time.sleep(delay)
+                continue
+            except requests.exceptions.RequestException as e:
+                raise DataFetchError(f"Finnhub API请求失败: {str(e)}")
+            
+            self._rate_window_observe(response)
             
             if response.status_code == 429:
-                raise RateLimitError("Finnhub API请求频率超限")
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # 检查API错误
-            if "error" in data:
-                raise DataFetchError(f"Finnhub API错误: {data['error']}")
-            
-            return data
-            
-        except requests.exceptions.RequestException as e:
-            raise DataFetchError(f"Finnhub API请求失败: {str(e)}")
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self._concurrency.on_throttle(retry_after)
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise RateLimitError("Finnhub API请求频率超限")
+                # 优先遵循服务端建议的等待时间
+                delay = retry_after or backoff_delay(attempt)
+                logger.debug(f"[{self.name}] {endpoint} 触发限流，{delay:.1f} 秒后重试")
+                time.sleep(delay)
+                continue
+            
+            try:
+                response.raise_for_status()
+                data = loads_json(response.content)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise DataFetchError(f"Finnhub API请求失败: {str(e)}")
+            break
+        
+        # 检查API错误
+        if "error" in data:
+            raise DataFetchError(f"Finnhub API错误: {data['error']}")
+        
+        if cache_ttl:
+            self._disk.set(cache_key, data, ttl=cache_ttl, namespace=endpoint)
+        return data
     
     def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -199,12 +329,16 @@ class FinnhubFetcher(BaseFetcher):
             period: 周期
             
         Returns:
-            技术指标数据列表
+            技术指标数据列表，sma/ema/rsi 为 {timestamp, value}，
+            bbands 为 {timestamp, upper, middle, lower}，
+            macd 为 {timestamp, macd, signal, histogram}
         """
         try:
-            # 先获取历史价格数据
-            end_time = int(datetime.now().timestamp())
-            start_time = int((datetime.now() - timedelta(days=365)).timestamp())
+            # 先获取历史价格数据：起止时间对齐到K线粒度（分钟线按分钟数，日/周/月线按天），
+            # 粒度内的重复调用请求参数不变，才能命中磁盘缓存
+            bucket = _candle_bucket(resolution)
+            end_time = -(-int(time.time()) // bucket) * bucket
+            start_time = end_time - 365 * 86400
             
             price_data = self._make_request("stock/candle", {
                 "symbol": symbol,
@@ -216,21 +350,48 @@ class FinnhubFetcher(BaseFetcher):
             if not price_data or price_data.get("s") != "ok":
                 return None
             
-            # 计算简单移动平均线示例
+            closes = pd.Series(price_data.get("c", []), dtype="float64")
+            timestamps = pd.Series(price_data.get("t", []), dtype="int64")
+            if len(closes) < period:
+                return None
+            
+            # 向量化计算（pandas rolling/ewm），不再逐窗口切片求和
             if indicator == "sma":
-                closes = price_data.get("c", [])
-                if len(closes) >= period:
-                    sma_values = []
-                    for i in range(period - 1, len(closes)):
-                        avg = sum(closes[i-period+1:i+1]) / period
-                        timestamp = price_data.get("t", [])[i]
-                        sma_values.append({
-                            "timestamp": timestamp,
-                            "value": avg
-                        })
-                    return sma_values
+                values = pd.DataFrame({"value": closes.rolling(period).mean()})
+            elif indicator == "ema":
+                values = pd.DataFrame({"value": closes.ewm(span=period, adjust=False, min_periods=period).mean()})
+            elif indicator == "rsi":
+                # Wilder 平滑：alpha = 1 / period
+                delta = closes.diff()
+                gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+                loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean()
+                rsi = 100 - 100 / (1 + gain / loss)
+                rsi[loss == 0] = 100.0
+                rsi.iloc[:period] = float("nan")
+                values = pd.DataFrame({"value": rsi})
+            elif indicator == "bbands":
+                middle = closes.rolling(period).mean()
+                std = closes.rolling(period).std(ddof=0)
+                values = pd.DataFrame({
+                    "upper": middle + 2 * std,
+                    "middle": middle,
+                    "lower": middle - 2 * std
+                })
+            elif indicator == "macd":
+                # 标准参数 12/26/9，忽略 period
+                macd = closes.ewm(span=12, adjust=False).mean() - closes.ewm(span=26, adjust=False, min_periods=26).mean()
+                signal = macd.ewm(span=9, adjust=False).mean()
+                values = pd.DataFrame({
+                    "macd": macd,
+                    "signal": signal,
+                    "histogram": macd - signal
+                })
+            else:
+                logger.warning(f"[{self.name}] 不支持的技术指标: {indicator}")
+                return None
             
-            return None
+            values.insert(0, "timestamp", timestamps)
+            return values.dropna().to_dict("records")
             
         except Exception as e:
             logger.warning(f"[{self.name}] 获取技术指标失败 {symbol}: {e}")
@@ -248,10 +409,11 @@ class FinnhubFetcher(BaseFetcher):
             新闻列表
         """
         try:
+            now = datetime.now()
             data = self._make_request("company-news", {
                 "symbol": symbol,
-                "from": (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d"),
-                "to": datetime.now().strftime("%Y-%m-%d")
+                "from": (now - timedelta(days=7)).strftime("%Y-%m-%d"),
+                "to": now.strftime("%Y-%m-%d")
             })
             
             if isinstance(data, list):
@@ -293,24 +455,28 @@ class FinnhubFetcher(BaseFetcher):
             if not data or data.get("s") != "ok":
                 raise DataFetchError("获取历史数据失败")
             
-            # 转换为DataFrame
-            df = pd.DataFrame({
-                "date": [datetime.fromtimestamp(t).strftime("%Y-%m-%d") for t in data.get("t", [])],
-                "open": data.get("o", []),
-                "high": data.get("h", []),
-                "low": data.get("l", []),
-                "close": data.get("c", []),
-                "volume": data.get("v", [])
-            })
+            # JSON 列数组直接转为 NumPy 列（SoA），一次构建 DataFrame，不再逐列推断类型
+            columns = {
+                name: np.asarray(data.get(key, []), dtype=np.float64)
+                for name, key in _CANDLE_COLUMNS
+            }
+            closes = columns["close"]
             
             # 计算涨跌幅
-            if len(df) > 1:
-                df["pct_chg"] = df["close"].pct_change() * 100
-            else:
-                df["pct_chg"] = 0.0
+            pct_chg = np.zeros_like(closes)
+            if len(closes) > 1:
+                pct_chg[0] = np.nan
+                pct_chg[1:] = (closes[1:] / closes[:-1] - 1) * 100
             
-            # 添加成交额（估算）
-            df["amount"] = df["close"] * df["volume"]
+            # 日期保持 datetime64，由 _clean_data 统一处理，不做字符串往返；
+            # normalize 截到日粒度，时间戳不在零点的K线也能与其他数据源按日期对齐
+            df = pd.DataFrame({
+                "date": pd.to_datetime(np.asarray(data.get("t", []), dtype=np.int64), unit="s").normalize(),
+                **columns,
+                "pct_chg": pct_chg,
+                # 添加成交额（估算）
+                "amount": closes * columns["volume"]
+            }, copy=False)
             
             return df
             
@@ -340,17 +506,12 @@ class FinnhubFetcher(BaseFetcher):
         Returns:
             Finnhub格式的股票代码
         """
-        # A股: 600519 -> 600519.SS (上海) 或 000001 -> 000001.SZ (深圳)
-        if stock_code.startswith(("6", "5")):  # 上海证券交易所
-            return f"{stock_code}.SS"
-        elif stock_code.startswith(("0", "3")):  # 深圳证券交易所
-            return f"{stock_code}.SZ"
-        # 港股: 00700 -> 00700.HK
-        elif stock_code.isdigit() and len(stock_code) == 5:
-            return f"{stock_code}.HK"
-        # 美股: AAPL -> AAPL (保持不变)
-        else:
-            return stock_code.upper()
+        return _to_finnhub_symbol(stock_code)
+    
+    def _get_quote_limited(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """在并发控制器的名额内获取报价"""
+        with self._concurrency.slot():
+            return self.get_quote(symbol)
     
     def get_main_indices(self) -> Optional[List[Dict[str, Any]]]:
         """
@@ -365,9 +526,14 @@ class FinnhubFetcher(BaseFetcher):
             {"symbol": "HSI", "name": "恒生指数"}
         ]
         
+        # 各指数报价相互独立，在线程池中并发请求（requests 在等待网络时释放GIL），
+        # 实际并发数由 AIMD 控制器按耗时和限流情况调整
+        with ThreadPoolExecutor(max_workers=len(indices)) as executor:
+            quotes = list(executor.map(self._get_quote_limited, [index["symbol"] for index in indices]))
+        self._concurrency.adjust()
+        
         results = []
-        for index in indices:
-            quote = self.get_quote(index["symbol"])
+        for index, quote in zip(indices, quotes):
             if quote:
                 results.append({
                     "symbol": index["symbol"],
@@ -0,0 +1,632 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+HTTP 数据源公共工具
+===================================
+
+为基于 REST API 的数据源（CoinGecko、Coindesk 等）提供：
+1. 带连接池与底层重试的 requests.Session 构建
+2. 进程退出时统一关闭会话，按 API 主机共享会话
+3. 进程内 TTL 响应缓存
+4. 客户端令牌桶限流与 Retry-After 解析
+5. 快速 JSON 编解码（优先使用 orjson）
+6. 磁盘 TTL 缓存（跨进程/跨运行复用不变的历史数据）
+7. 滑动窗口限流 + X-Ratelimit 响应头反馈（Mixin）
+8. AIMD 自适应并发控制（批量并发请求）
+9. 可选的 Prometheus 请求指标（METRICS_ENABLED=true 且安装 prometheus_client 时启用）
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 客户端可解压的响应压缩格式：安装 brotli 后自动包含 br，否则为 gzip,deflate
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+# 已创建的会话（弱引用），进程退出时统一关闭
+_sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+
+
+def build_session(
+    headers: Optional[Dict[str, str]] = None,
+    pool_connections: int = 32,
+    pool_maxsize: int = 32,
+    max_retries: Optional[Retry] = None,
+    pool_block: bool = True,
+) -> requests.Session:
+    """
+    创建带连接池的 HTTP 会话
+
+    默认连接池（10 个连接）在并发请求时容易被打满，导致连接被丢弃、
+    重复进行 TCP/TLS 握手。这里挂载调大后的 HTTPAdapter，并对 5xx
+    错误做底层退避重试。请求头声明本地可解压的全部压缩格式（含 br）。
+
+    Args:
+        headers: 会话默认请求头
+        pool_connections: 缓存的主机连接池数量
+        pool_maxsize: 单个主机连接池的最大连接数
+        max_retries: urllib3 重试策略（默认 5xx 退避重试 3 次）
+        pool_block: 连接池用满时是否等待空闲连接。开启后并发突发会复用
+            已建立的长连接，而不是临时新建、用完即丢弃的连接
+
+    Returns:
+        配置好的 requests.Session
+    """
+    if max_retries is None:
+        max_retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[500, 502, 503, 504],
+        )
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers["Connection"] = "keep-alive"
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    if headers:
+        session.headers.update(headers)
+
+    _sessions.add(session)
+    return session
+
+
+# 进程级共享会话（按 API 主机分组），多次实例化 Fetcher 时复用 TCP/TLS 连接
+_SESSION_REGISTRY: Dict[str, requests.Session] = {}
+_registry_lock = threading.Lock()
+
+
+def get_shared_session(key: str, **kwargs: Any) -> requests.Session:
+    """
+    获取（首次调用时创建）按 key 共享的会话
+
+    Args:
+        key: 共享键（通常为 API 的 base_url）
+        **kwargs: 首次创建时传给 build_session 的参数
+
+    注意：共享会话上的默认请求头对所有使用者可见，API 密钥等
+    与实例相关的请求头应在每次请求时单独传入。
+    """
+    with _registry_lock:
+        session = _SESSION_REGISTRY.get(key)
+        if session is None:
+            session = build_session(**kwargs)
+            _SESSION_REGISTRY[key] = session
+        return session
+
+
+def close_shared_session(key: str) -> None:
+    """关闭并移除共享会话（之后再获取时重新创建）"""
+    with _registry_lock:
+        session = _SESSION_REGISTRY.pop(key, None)
+    if session is not None:
+        session.close()
+
+
+@atexit.register
+def _close_all_sessions() -> None:
+    """关闭所有仍存活的会话（atexit 钩子）"""
+    for session in list(_sessions):
+        try:
+            session.close()
+        except Exception as e:
+            logger.debug(f"关闭 HTTP 会话失败: {e}")
+
+
+class TTLCache:
+    """
+    线程安全的 TTL 缓存
+
+    - 每个条目可单独指定有效期
+    - 超过容量时优先淘汰最早写入的条目
+    - 记录命中/未命中次数，便于观察缓存效果
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 30.0):
+        """
+        Args:
+            maxsize: 最大条目数
+            ttl: 默认有效期（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取未过期的缓存，未命中返回 default"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """写入缓存"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (expires_at, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def make_cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, Tuple]:
+    """根据请求地址和参数生成缓存键（参数顺序无关）"""
+    return url, tuple(sorted((params or {}).items()))
+
+
+class TokenBucket:
+    """
+    令牌桶限流器（自适应速率）
+
+    - 请求前调用 acquire()，令牌不足时阻塞等待
+    - 请求成功调用 on_success()，速率加性增长（不超过 max_rate）
+    - 触发限流调用 on_throttle()，速率乘性减半（不低于 min_rate）
+    """
+
+    def __init__(
+        self,
+        capacity: float = 30,
+        refill_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        min_rate: Optional[float] = None,
+    ):
+        """
+        Args:
+            capacity: 桶容量（允许的突发请求数）
+            refill_rate: 初始补充速率（个/秒）
+            max_rate: 速率上限（默认等于初始速率，即限流后逐步恢复）
+            min_rate: 速率下限（默认为初始速率的 1/8）
+        """
+        self.capacity = float(capacity)
+        self.rate = float(refill_rate)
+        self.max_rate = float(max_rate) if max_rate is not None else self.rate
+        self.min_rate = float(min_rate) if min_rate is not None else self.rate / 8
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        获取令牌，不足时阻塞到补足为止
+
+        Returns:
+            实际等待的秒数
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait_time = (tokens - self._tokens) / self.rate
+            logger.debug(f"[限流] 令牌不足，等待 {wait_time:.2f} 秒")
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def on_success(self) -> None:
+        """请求成功：速率加性增长"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.01)
+
+    def on_throttle(self) -> None:
+        """触发限流：速率乘性减半"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+
+class RateLimitWindowMixin:
+    """
+    滑动窗口限流 + 响应头反馈（供数据源 Fetcher 混入）
+
+    - 请求前调用 _rate_window_wait()：最近 window 秒内已发出 limit 次请求时，
+      等到最早的一次滑出窗口；服务端提示额度将尽时，等到额度重置
+    - 收到响应后调用 _rate_window_observe(response)：读取
+      X-Ratelimit-Remaining / X-Ratelimit-Reset，剩余额度不足时暂停发送
+
+    令牌桶允许一次性突发 capacity 个请求，加上持续补充，一分钟内可能超出
+    服务端的硬性上限；滑动窗口保证任意 window 秒内不超过 limit 次。
+    """
+
+    def _init_rate_window(
+        self,
+        limit: Optional[int] = 60,
+        window: float = 60.0,
+        min_remaining: int = 2,
+    ) -> None:
+        """
+        Args:
+            limit: 窗口内最大请求数（None 表示只根据响应头限流）
+            window: 窗口长度（秒）
+            min_remaining: 响应头剩余额度不高于该值时暂停到重置时间
+        """
+        self._rate_limit = limit
+        self._rate_window = window
+        self._rate_min_remaining = min_remaining
+        self._rate_sent: "deque[float]" = deque()
+        self._rate_pause_until = 0.0
+        self._rate_lock = threading.Lock()
+
+    def _rate_window_wait(self) -> None:
+        """发送请求前调用，必要时阻塞"""
+        while True:
+            with self._rate_lock:
+                now = time.time()
+                wait_time = self._rate_pause_until - now
+                if wait_time <= 0 and self._rate_limit:
+                    cutoff = now - self._rate_window
+                    while self._rate_sent and self._rate_sent[0] <= cutoff:
+                        self._rate_sent.popleft()
+                    if len(self._rate_sent) >= self._rate_limit:
+                        wait_time = self._rate_sent[0] + self._rate_window - now
+                if wait_time <= 0:
+                    self._rate_sent.append(now)
+                    return
+            logger.debug(f"[限流] 滑动窗口已满或额度将尽，等待 {wait_time:.2f} 秒")
+            time.sleep(wait_time)
+
+    def _rate_window_observe(self, response: requests.Response) -> None:
+        """根据 X-Ratelimit-* 响应头更新暂停时间"""
+        remaining = response.headers.get("X-Ratelimit-Remaining")
+        reset = response.headers.get("X-Ratelimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining_count = int(remaining)
+            reset_at = float(reset)
+        except ValueError:
+            return
+        if remaining_count > self._rate_min_remaining:
+            return
+        # Reset 为 Unix 时间戳（秒），最长暂停一个窗口，防止异常值导致长时间阻塞
+        pause_until = min(reset_at, time.time() + self._rate_window)
+        with self._rate_lock:
+            self._rate_pause_until = max(self._rate_pause_until, pause_until)
+
+
+class AIMDConcurrency:
+    """
+    AIMD 自适应并发控制
+
+    固定并发数的批量请求容易压垮服务端；这里按最近请求的表现动态调整：
+    - 每批请求结束后调用 adjust()：最近 window 次请求平均耗时不超过
+      target_latency 时并发数 +0.5（加性增），否则减半（乘性减）
+    - 触发限流调用 on_throttle()：并发数立即减半，并暂停到 Retry-After
+      之后（熔断），暂停期间不放行新请求
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        target_latency: float = 2.0,
+        window: int = 16,
+    ):
+        """
+        Args:
+            initial: 初始并发数
+            min_limit: 并发数下限
+            max_limit: 并发数上限
+            target_latency: 目标平均耗时（秒）
+            window: 计算平均耗时的样本数
+        """
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self._latencies: "deque[float]" = deque(maxlen=window)
+        self._active = 0
+        self._pause_until = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """占用一个并发名额，退出时记录耗时"""
+        with self._cond:
+            while True:
+                wait_time = self._pause_until - time.monotonic()
+                if wait_time <= 0 and self._active < int(self.limit):
+                    break
+                self._cond.wait(timeout=wait_time if wait_time > 0 else None)
+            self._active += 1
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._cond:
+                self._active -= 1
+                self._latencies.append(elapsed)
+                self._cond.notify_all()
+
+    def adjust(self) -> float:
+        """按最近的平均耗时调整并发数，返回调整后的并发数"""
+        with self._cond:
+            if self._latencies:
+                avg_latency = sum(self._latencies) / len(self._latencies)
+                if avg_latency <= self.target_latency:
+                    self.limit = min(self.max_limit, self.limit + 0.5)
+                else:
+                    self.limit = max(self.min_limit, self.limit * 0.5)
+            self._cond.notify_all()
+            return self.limit
+
+    def on_throttle(self, retry_after: float = 0.0) -> None:
+        """触发限流：并发数减半，并在 retry_after 秒内暂停放行"""
+        with self._cond:
+            self.limit = max(self.min_limit, self.limit * 0.5)
+            if retry_after > 0:
+                self._pause_until = max(self._pause_until, time.monotonic() + retry_after)
+            self._cond.notify_all()
+        logger.debug(f"[并发控制] 触发限流，并发数降为 {int(self.limit)}")
+
+
+def parse_retry_after(value: Optional[str], max_seconds: float = 60.0) -> float:
+    """
+    解析 Retry-After 响应头（仅支持秒数格式）
+
+    Returns:
+        建议等待的秒数（无法解析时返回 0），不超过 max_seconds
+    """
+    if not value:
+        return 0.0
+    try:
+        return min(max(float(value), 0.0), max_seconds)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 4.0) -> float:
+    """第 attempt 次（从0开始）重试前的指数退避等待时间（秒）"""
+    return min(base * (2 ** attempt), cap)
+
+
+def loads_json(content: bytes) -> Any:
+    """
+    解码 JSON 响应体
+
+    直接解析 response.content（bytes），安装了 orjson 时使用 orjson，
+    否则回退到标准库 json。
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps_json(obj: Any) -> bytes:
+    """
+    编码 JSON 请求体（UTF-8 bytes）
+
+    配合 requests 的 data= 参数使用，需自行设置 content-type；
+    安装了 orjson 时使用 orjson，否则回退到标准库 json。
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+# 写入中断残留的临时文件超过该时长（秒）后由清理删除（更新的可能仍在写入）
+_TMP_FILE_MAX_AGE = 3600
+
+
+class FileCache:
+    """
+    基于 JSON 文件的磁盘 TTL 缓存
+
+    每个条目存为 <directory>/<namespace>/<md5(key)>.json，内容为
+    {"ts": 写入时间, "ttl": 有效期, "data": 数据}。读取时检查有效期，
+    过期即删除。缓存键常带日期或时间窗口，旧键不会再被读取，因此创建时
+    以及每 sweep_every 次写入后清理一遍目录，删除过期、损坏的缓存文件
+    和残留的临时文件。缓存读写失败只记录日志，不影响正常请求。
+    """
+
+    def __init__(self, directory: str, ttl: float = 3600.0, sweep_every: int = 256):
+        """
+        Args:
+            directory: 缓存根目录
+            ttl: 默认有效期（秒）
+            sweep_every: 每写入多少次清理一次过期文件（0 表示只在创建时清理）
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.sweep_every = sweep_every
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self.sweep()
+
+    def _path(self, key: str, namespace: str = "") -> str:
+        digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, namespace, f"{digest}.json")
+
+    def _read_entry(self, path: str) -> Optional[Dict[str, Any]]:
+        """读取缓存文件，文件不存在、损坏或格式不符时返回 None"""
+        try:
+            with open(path, "rb") as f:
+                entry = loads_json(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"[磁盘缓存] 读取失败 {path}: {e}")
+            return None
+        if not isinstance(entry, dict):
+            logger.debug(f"[磁盘缓存] 格式不符 {path}")
+            return None
+        return entry
+
+    def _is_expired(self, entry: Dict[str, Any], now: float) -> bool:
+        """条目是否过期（ts/ttl 不是数字时按过期处理）"""
+        try:
+            return now - entry.get("ts", 0) >= entry.get("ttl", self.ttl)
+        except TypeError:
+            return True
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def get(self, key: str, namespace: str = "") -> Any:
+        """读取未过期的缓存，未命中返回 None"""
+        path = self._path(key, namespace)
+        entry = self._read_entry(path)
+        if entry is None:
+            return None
+        if self._is_expired(entry, time.time()):
+            self._remove(path)
+            return None
+        return entry.get("data")
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, namespace: str = "") -> None:
+        """写入缓存（先写临时文件再替换，避免读到半截文件）"""
+        path = self._path(key, namespace)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        entry = {"ts": time.time(), "ttl": self.ttl if ttl is None else ttl, "data": value}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"[磁盘缓存] 写入失败 {path}: {e}")
+            self._remove(tmp_path)
+
+        if self.sweep_every > 0:
+            with self._writes_lock:
+                self._writes += 1
+                due = self._writes % self.sweep_every == 0
+            if due:
+                self.sweep()
+
+    def sweep(self) -> int:
+        """
+        清理缓存目录：删除过期或损坏的缓存文件，以及超过 _TMP_FILE_MAX_AGE 的临时文件
+
+        Returns:
+            删除的文件数
+        """
+        now = time.time()
+        removed = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".tmp"):
+                    try:
+                        stale = now - os.path.getmtime(path) >= _TMP_FILE_MAX_AGE
+                    except OSError:
+                        continue
+                elif name.endswith(".json"):
+                    entry = self._read_entry(path)
+                    stale = entry is None or self._is_expired(entry, now)
+                else:
+                    continue
+                if stale and self._remove(path):
+                    removed += 1
+        if removed:
+            logger.debug(f"[磁盘缓存] 清理 {self.directory}，删除 {removed} 个文件")
+        return removed
+
+
+# Prometheus 指标（懒加载）：None 表示尚未初始化，False 表示未启用
+_metrics: Any = None
+_metrics_lock = threading.Lock()
+
+
+def _get_metrics() -> Any:
+    """创建/获取请求指标，未启用或未安装 prometheus_client 时返回 False"""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = False
+                if os.getenv("METRICS_ENABLED", "false").lower() == "true":
+                    try:
+                        from prometheus_client import Counter, Histogram
+                    except ImportError:
+                        logger.warning("METRICS_ENABLED=true 但未安装 prometheus_client，请求指标不可用")
+                    else:
+                        _metrics = (
+                            Histogram(
+                                "data_provider_request_seconds",
+                                "数据源 HTTP 请求耗时（秒）",
+                                ["source", "endpoint"],
+                            ),
+                            Counter(
+                                "data_provider_request_total",
+                                "数据源 HTTP 请求次数",
+                                ["source", "endpoint", "status"],
+                            ),
+                        )
+    return _metrics
+
+
+def record_request(source: str, endpoint: str, status: Any, seconds: float) -> None:
+    """
+    记录一次 HTTP 请求的耗时和结果
+
+    Args:
+        source: 数据源名称
+        endpoint: 端点模板（如 coins/{id}），不要传带具体参数的完整 URL，避免标签基数膨胀
+        status: HTTP 状态码，或网络异常时的 "error"
+        seconds: 请求耗时
+    """
+    metrics = _get_metrics()
+    if not metrics:
+        return
+    histogram, counter = metrics
+    histogram.labels(source, endpoint).observe(seconds)
+    counter.labels(source, endpoint, str(status)).inc()
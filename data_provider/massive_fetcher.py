@@ -16,19 +16,129 @@ API文档：https://massive.com/docs/rest/quickstart
 
 import logging
 import os
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
 
 import requests
+import numpy as np
 import pandas as pd
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from data_provider.base import BaseFetcher, DataFetchError, RateLimitError
+from data_provider.http_utils import (
+    FileCache,
+    RateLimitWindowMixin,
+    TTLCache,
+    backoff_delay,
+    close_shared_session,
+    get_shared_session,
+    loads_json,
+    parse_retry_after,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class MassiveFetcher(BaseFetcher):
+# 各端点的磁盘缓存有效期（秒）；未列出的端点不缓存
+_CACHE_TTLS = {
+    "news/search": 600,
+    "economic/calendar": 3600,
+}
+
+# 网络错误/限流时的最大尝试次数
+_MAX_ATTEMPTS = 3
+
+# 公司文章一次请求的默认条数（满足情绪分析所需的样本量）
+_COMPANY_ARTICLE_LIMIT = 50
+
+
+# 无法解析的发布时间视为最早，近期过滤时被丢弃
+_EPOCH = datetime.fromtimestamp(0, timezone.utc)
+
+
+def _published_at(article: Dict[str, Any]) -> datetime:
+    """解析文章发布时间（ISO 8601），不带时区的按 UTC 处理"""
+    try:
+        published = datetime.fromisoformat(article.get("published_at", "").replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return _EPOCH
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published
+
+
+# 新闻结果的公共字段：(字段名, 缺失时的默认值)；source 为嵌套对象，单独取 name
+_ARTICLE_FIELDS = (
+    ("title", ""),
+    ("summary", ""),
+    ("url", ""),
+    ("published_at", ""),
+    ("sentiment", "neutral"),
+    ("relevance_score", 0),
+)
+
+
+def _map_article(article: Dict[str, Any], extras: tuple = ()) -> Dict[str, Any]:
+    """
+    将 news/search 返回的文章映射为统一的结果字典
+    
+    Args:
+        article: 原始文章
+        extras: 额外保留的列表字段（如 symbols、industries），缺失时为 []
+    """
+    result = {field: article.get(field, default) for field, default in _ARTICLE_FIELDS}
+    result["source"] = (article.get("source") or {}).get("name", "")
+    for field in extras:
+        result[field] = article.get(field, [])
+    return result
+
+
+# 股票代码到公司名称的映射（实际应调用公司信息API），模块加载时构建一次
+_NAME_MAP = MappingProxyType({
+    "AAPL": "苹果",
+    "MSFT": "微软",
+    "GOOGL": "谷歌",
+    "AMZN": "亚马逊",
+    "TSLA": "特斯拉",
+    "NVDA": "英伟达",
+    "META": "Meta",
+    "600519": "贵州茅台",
+    "000001": "平安银行",
+    "300750": "宁德时代",
+    "00700": "腾讯控股"
+})
+
+
+@lru_cache(maxsize=1)
+def _load_name_file() -> Dict[str, str]:
+    """
+    加载扩展的代码-名称映射（JSON 对象，路径由 MASSIVE_COMPANY_NAMES_FILE 指定）
+    
+    首次查询时读取一次；未配置或读取失败时返回空映射。
+    """
+    path = os.getenv("MASSIVE_COMPANY_NAMES_FILE")
+    if not path:
+        return {}
+    try:
+        with open(path, "rb") as f:
+            names = loads_json(f.read())
+        return {str(code).upper(): str(name) for code, name in names.items()}
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"[Massive] 加载公司名称文件失败 {path}: {e}")
+        return {}
+
+
+@lru_cache(maxsize=8192)
+def _company_name(symbol_key: str) -> Optional[str]:
+    """按大写代码查询公司名称（扩展文件优先），未知代码返回 None"""
+    return _load_name_file().get(symbol_key) or _NAME_MAP.get(symbol_key)
+
+
+class MassiveFetcher(RateLimitWindowMixin, BaseFetcher):
     """
     Massive数据获取器
     
@@ -54,12 +164,35 @@ class MassiveFetcher(BaseFetcher):
             raise ValueError("Massive API密钥未配置，请设置MASSIVE_API_KEY环境变量")
         
         self.base_url = "https://api.massive.com/v1"
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Authorization": f"Bearer {self.api_key}",
-            "User-Agent": "StockAnalysisBot/1.0",
-            "Accept": "application/json"
-        })
+        # 进程级共享会话：调大连接池并保持长连接，多个实例复用已建立的 TLS 连接
+        self.session = get_shared_session(
+            self.base_url,
+            headers={
+                "User-Agent": "StockAnalysisBot/1.0",
+                "Accept": "application/json"
+            },
+            pool_connections=20,
+            pool_maxsize=50
+        )
+        # 会话在实例间共享，密钥随每次请求发送
+        self._auth_headers = {"Authorization": f"Bearer {self.api_key}"}
+        # 响应磁盘缓存：同一查询在有效期内直接复用，节省配额；过期文件（如旧的 published_after 查询）由 FileCache 定期清理
+        cache_dir = os.getenv("DATA_CACHE_DIR", ".cache")
+        self._disk = FileCache(os.path.join(cache_dir, "massive"))
+        # 额度因套餐而异，只根据 X-Ratelimit-* 响应头限流
+        self._init_rate_window(limit=None)
+        # 公司文章短期缓存：新闻与情绪分析共用同一次请求的结果
+        self._article_cache = TTLCache(maxsize=256, ttl=600)
+    
+    def close(self) -> None:
+        """关闭共享HTTP会话，释放连接池（之后新建的实例会重新创建会话）"""
+        close_shared_session(self.base_url)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """
@@ -76,19 +209,55 @@ class MassiveFetcher(BaseFetcher):
             RateLimitError: 请求频率超限
             DataFetchError: 其他API错误
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        endpoint = endpoint.lstrip('/')
         
-        try:
-            response = self.session.get(url, params=params, timeout=15)
+        cache_ttl = _CACHE_TTLS.get(endpoint)
+        cache_key = f"{endpoint}?{urlencode(sorted((params or {}).items()))}"
+        if cache_ttl:
+            cached = self._disk.get(cache_key, namespace=endpoint)
+            if cached is not None:
+                logger.debug(f"[{self.name}] 磁盘缓存命中 {endpoint}")
+                return cached
+        
+        url = f"{self.base_url}/{endpoint}"
+        
+        for attempt in range(_MAX_ATTEMPTS):
+            self._rate_window_wait()
+            
+            try:
+                response = self.session.get(url, params=params, headers=self._auth_headers, timeout=15)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise DataFetchError(f"Massive API请求失败: {str(e)}")
+                delay = backoff_delay(attempt)
+                logger.debug(f"[{self.name}] {endpoint} 网络错误，{delay:.1f} 秒后重试: {e}")
+                time.sleep(delay)
+                continue
+            except requests.exceptions.RequestException as e:
+                raise DataFetchError(f"Massive API请求失败: {str(e)}")
+            
+            self._rate_window_observe(response)
             
             if response.status_code == 429:
-                raise RateLimitError("Massive API请求频率超限")
-            
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            raise DataFetchError(f"Massive API请求失败: {str(e)}")
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise RateLimitError("Massive API请求频率超限")
+                # 优先遵循服务端建议的等待时间
+                delay = retry_after or backoff_delay(attempt)
+                logger.debug(f"[{self.name}] {endpoint} 触发限流，{delay:.1f} 秒后重试")
+                time.sleep(delay)
+                continue
+            
+            try:
+                response.raise_for_status()
+                data = loads_json(response.content)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise DataFetchError(f"Massive API请求失败: {str(e)}")
+            break
+        
+        if cache_ttl:
+            self._disk.set(cache_key, data, ttl=cache_ttl, namespace=endpoint)
+        return data
     
     def search_news(
         self,
@@ -122,18 +291,7 @@ class MassiveFetcher(BaseFetcher):
             data = self._make_request("news/search", params)
             
             articles = data.get("articles", [])
-            results = []
-            
-            for article in articles:
-                results.append({
-                    "title": article.get("title", ""),
-                    "summary": article.get("summary", ""),
-                    "url": article.get("url", ""),
-                    "source": article.get("source", {}).get("name", ""),
-                    "published_at": article.get("published_at", ""),
-                    "sentiment": article.get("sentiment", "neutral"),
-                    "relevance_score": article.get("relevance_score", 0)
-                })
+            results = [_map_article(article) for article in articles]
             
             return results
             
@@ -141,6 +299,50 @@ class MassiveFetcher(BaseFetcher):
             logger.warning(f"[{self.name}] 搜索新闻失败: {e}")
             return None
     
+    def _fetch_company_articles(
+        self,
+        symbol: str,
+        days: int,
+        limit: int = _COMPANY_ARTICLE_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        获取公司相关的原始文章（get_company_news 与 get_market_sentiment 共用）
+        
+        两者查询条件相同，只是使用的条数和处理方式不同；这里一次请求取足
+        limit 条并短期缓存，同一标的先后获取新闻和情绪时只发一次请求。
+        
+        Args:
+            symbol: 股票代码
+            days: 获取最近几天的文章
+            limit: 请求的文章数量
+            
+        Returns:
+            原始文章列表（按发布时间倒序）
+        """
+        symbol_key = symbol.upper()
+        cache_key = (symbol_key, days, limit)
+        articles = self._article_cache.get(cache_key)
+        if articles is not None:
+            return articles
+        
+        company_name = _company_name(symbol_key) or symbol
+        query = f"{company_name} OR {symbol}"
+        
+        since_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        
+        params = {
+            "q": query,
+            "language": "zh",
+            "published_after": since_date,
+            "limit": limit,
+            "sort": "published_at:desc"
+        }
+        
+        data = self._make_request("news/search", params)
+        articles = data.get("articles", [])
+        self._article_cache.set(cache_key, articles)
+        return articles
+    
     def get_company_news(
         self,
         symbol: str,
@@ -159,42 +361,18 @@ class MassiveFetcher(BaseFetcher):
             公司新闻列表
         """
         try:
-            # 构造搜索查询
-            company_name = self._get_company_name(symbol)
-            query = f"{company_name} OR {symbol}"
-            
-            since_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-            
-            params = {
-                "q": query,
-                "language": "zh",
-                "published_after": since_date,
-                "limit": limit,
-                "sort": "published_at:desc"
-            }
-            
-            data = self._make_request("news/search", params)
-            
-            articles = data.get("articles", [])
+            articles = self._fetch_company_articles(symbol, days, max(limit, _COMPANY_ARTICLE_LIMIT))
             results = []
             
+            # 截止时间只计算一次；发布时间为带时区的 UTC 时间，统一按 UTC 比较
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+            
             for article in articles:
-                published_date = datetime.fromisoformat(
-                    article.get("published_at", "").replace("Z", "+00:00")
-                )
-                
                 # 只保留近期新闻
-                if published_date >= datetime.now() - timedelta(days=days):
-                    results.append({
-                        "title": article.get("title", ""),
-                        "summary": article.get("summary", ""),
-                        "url": article.get("url", ""),
-                        "source": article.get("source", {}).get("name", ""),
-                        "published_at": article.get("published_at", ""),
-                        "sentiment": article.get("sentiment", "neutral"),
-                        "relevance_score": article.get("relevance_score", 0),
-                        "symbols": article.get("symbols", [])
-                    })
+                if _published_at(article) >= cutoff:
+                    results.append(_map_article(article, extras=("symbols",)))
+                    if len(results) >= limit:
+                        break
             
             return results
             
@@ -218,48 +396,27 @@ class MassiveFetcher(BaseFetcher):
             情绪分析结果
         """
         try:
-            company_name = self._get_company_name(symbol)
-            query = f"{company_name} OR {symbol}"
-            
-            since_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-            
-            params = {
-                "q": query,
-                "language": "zh",
-                "published_after": since_date,
-                "limit": 50
-            }
-            
-            data = self._make_request("news/search", params)
-            articles = data.get("articles", [])
+            articles = self._fetch_company_articles(symbol, days)
             
             if not articles:
                 return None
             
-            # 计算情绪得分
-            positive_count = 0
-            negative_count = 0
-            neutral_count = 0
-            total_relevance = 0
-            
-            for article in articles:
-                sentiment = article.get("sentiment", "neutral")
-                relevance = article.get("relevance_score", 0)
-                
-                if sentiment == "positive":
-                    positive_count += 1
-                elif sentiment == "negative":
-                    negative_count += 1
-                else:
-                    neutral_count += 1
-                
-                total_relevance += relevance
-            
+            # 计算情绪得分（整列比较/求均值，不再逐篇分支累加）
             total_articles = len(articles)
-            avg_relevance = total_relevance / total_articles if total_articles > 0 else 0
+            sentiments = np.array([article.get("sentiment", "neutral") for article in articles])
+            relevance = np.fromiter(
+                (article.get("relevance_score", 0) or 0 for article in articles),
+                dtype=np.float64,
+                count=total_articles
+            )
+            
+            positive_count = int(np.count_nonzero(sentiments == "positive"))
+            negative_count = int(np.count_nonzero(sentiments == "negative"))
+            neutral_count = total_articles - positive_count - negative_count
+            avg_relevance = float(relevance.mean())
             
             # 计算情绪指数 (-1到1)
-            sentiment_score = (positive_count - negative_count) / total_articles if total_articles > 0 else 0
+            sentiment_score = (positive_count - negative_count) / total_articles
             
             return {
                 "symbol": symbol,
@@ -317,19 +474,7 @@ class MassiveFetcher(BaseFetcher):
             data = self._make_request("news/search", params)
             
             articles = data.get("articles", [])
-            results = []
-            
-            for article in articles:
-                results.append({
-                    "title": article.get("title", ""),
-                    "summary": article.get("summary", ""),
-                    "url": article.get("url", ""),
-                    "source": article.get("source", {}).get("name", ""),
-                    "published_at": article.get("published_at", ""),
-                    "sentiment": article.get("sentiment", "neutral"),
-                    "relevance_score": article.get("relevance_score", 0),
-                    "industries": article.get("industries", [])
-                })
+            results = [_map_article(article, extras=("industries",)) for article in articles]
             
             return results
             
@@ -389,21 +534,7 @@ class MassiveFetcher(BaseFetcher):
         """
         根据股票代码获取公司名称（简化版）
         """
-        # 股票代码到公司名称的映射（实际应调用公司信息API）
-        name_map = {
-            "AAPL": "苹果",
-            "MSFT": "微软",
-            "GOOGL": "谷歌",
-            "AMZN": "亚马逊",
-            "TSLA": "特斯拉",
-            "NVDA": "英伟达",
-            "META": "Meta",
-            "600519": "贵州茅台",
-            "000001": "平安银行",
-            "300750": "宁德时代",
-            "00700": "腾讯控股"
-        }
-        return name_map.get(symbol.upper(), symbol)
+        return _company_name(symbol.upper()) or symbol
     
     def _classify_sentiment(self, score: float) -> str:
         """
@@ -435,14 +566,24 @@ class MassiveFetcher(BaseFetcher):
         try:
             indices = ["恒生指数", "道琼斯", "纳斯达克", "标普500"]
             
+            # 各指数的新闻搜索相互独立，在线程池中并发请求
+            with ThreadPoolExecutor(max_workers=len(indices)) as executor:
+                futures = {
+                    executor.submit(
+                        self.search_news,
+                        query=index,
+                        language="zh",
+                        categories=["markets", "economy"],
+                        limit=3
+                    ): index
+                    for index in indices
+                }
+                news_by_index = {futures[future]: future.result() for future in as_completed(futures)}
+            
+            # 按指数原有顺序合并，结果不受完成先后影响
             all_news = []
             for index in indices:
-                news = self.search_news(
-                    query=index,
-                    language="zh",
-                    categories=["markets", "economy"],
-                    limit=3
-                )
+                news = news_by_index.get(index)
                 if news:
                     for item in news:
                         item["index"] = index
@@ -12,6 +12,7 @@
 使用方式：
 - 所有 Fetcher 的 get_realtime_quote() 统一返回 UnifiedRealtimeQuote
 - CircuitBreaker 管理各数据源的熔断状态
+- 加密货币数据源的报价统一返回 CryptoQuote
 """
 
 import logging
@@ -262,6 +263,42 @@ class ChipDistribution:
         return "，".join(status_parts)
 
 
+@dataclass(slots=True, frozen=True)
+class CryptoQuote:
+    """
+    加密货币报价
+    
+    CryptoFetcher / CoindeskFetcher 的报价统一返回此结构：
+    - slots 存储，批量报价（如 get_top_coins(100)）比逐条构建字典更省内存
+    - 不可变，可安全地在缓存和多线程间共享
+    - 各接口返回字段不同，缺失字段为 None，to_dict() 时过滤
+    """
+    symbol: str
+    name: str = ""
+    price: float = 0.0
+    price_change_24h: Optional[float] = None            # 24小时涨跌额
+    price_change_percentage_24h: Optional[float] = None  # 24小时涨跌幅(%)
+    market_cap: Optional[float] = None                  # 市值
+    volume_24h: Optional[float] = None                  # 24小时成交量
+    open_24h: Optional[float] = None
+    high_24h: Optional[float] = None
+    low_24h: Optional[float] = None
+    circulating_supply: Optional[float] = None          # 流通量
+    total_supply: Optional[float] = None                # 总供应量
+    rank: Optional[int] = None                          # 市值排名
+    timestamp: Optional[int] = None
+    source: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（过滤 None 值）"""
+        result = {}
+        for f in self.__slots__:
+            val = getattr(self, f)
+            if val is not None:
+                result[f] = val
+        return result
+
+
 class CircuitBreaker:
     """
     熔断器 - 管理数据源的熔断/冷却状态
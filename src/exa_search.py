@@ -13,17 +13,98 @@ Exa搜索引擎集成
 API文档：https://exa.ai/docs/reference/search-best-practices
 """
 
+import hashlib
+import json
 import logging
 import os
-from typing import Optional, Dict, Any, List
+import time
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from urllib3.util.retry import Retry
+
+from data_provider.http_utils import TTLCache, dumps_json, get_shared_session, loads_json
 
 logger = logging.getLogger(__name__)
 
 
+_BASE_URL = "https://api.exa.ai"
+
+
+def _get_shared_session() -> requests.Session:
+    """
+    进程级共享会话
+    
+    调大连接池并保持长连接；429/5xx 由 urllib3 按 Retry-After 退避重试
+    （Exa 接口均为 POST，需显式允许重试）。
+    """
+    return get_shared_session(
+        _BASE_URL,
+        headers={
+            "accept": "application/json",
+            "content-type": "application/json"
+        },
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"])
+        )
+    )
+
+
+# 进程级响应缓存：同一请求体在有效期内直接复用，跨实例（多 API Key）共享
+_SEARCH_CACHE = TTLCache(maxsize=1024, ttl=300)
+_CONTENTS_CACHE = TTLCache(maxsize=2048, ttl=1800)
+
+# 健康检查结果有效期（秒）
+_AVAIL_CACHE_TTL = 60
+# 表示 API Key 无效或已被吊销的状态码
+_AUTH_ERROR_CODES = (401, 403)
+
+# 市场新闻查询词
+_MARKET_QUERIES = MappingProxyType({
+    "A股": "A股市场 最新动态 上证指数 深证成指 创业板指",
+    "港股": "港股市场 恒生指数 最新行情 港股通",
+    "美股": "美股市场 道琼斯 纳斯达克 标普500",
+    "全球": "全球股市 国际市场 金融市场 动态"
+})
+
+# 个股情报限定的财经站点
+_STOCK_DOMAINS = (
+    "sina.com.cn",
+    "163.com",
+    "eastmoney.com",
+    "cs.com.cn",
+    "cnstock.com",
+    "yicai.com",
+    "caixin.com",
+    "ftchinese.com"
+)
+
+# 市场新闻限定的财经站点（含境外媒体）
+_MARKET_DOMAINS = (
+    "sina.com.cn",
+    "163.com",
+    "eastmoney.com",
+    "cnstock.com",
+    "yicai.com",
+    "caixin.com",
+    "ftchinese.com",
+    "reuters.com",
+    "bloomberg.com"
+)
+
+
+def _payload_key(path: str, payload: Dict[str, Any]) -> bytes:
+    """根据接口路径和请求体生成缓存键（字段顺序无关，不含 API Key）"""
+    raw = json.dumps({"path": path, **payload}, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
+
 class ExaSearchError(Exception):
     """Exa搜索异常"""
     pass
@@ -51,26 +132,29 @@ class ExaSearchService:
         if not self.api_key:
             raise ValueError("Exa API密钥未配置，请设置EXA_API_KEY环境变量")
         
-        self.base_url = "https://api.exa.ai"
-        self.session = requests.Session()
-        self.session.headers.update({
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {self.api_key}"
-        })
+        self.base_url = _BASE_URL
+        # 所有实例（多个 API Key 轮询）共用一个连接池，密钥随每次请求发送
+        self.session = _get_shared_session()
+        self._auth_headers = {"authorization": f"Bearer {self.api_key}"}
+        # 健康检查结果缓存: (检查时间, 是否可用)
+        self._avail_cache: Tuple[float, bool] = (0.0, False)
+        # 请求曾返回 401/403：API Key 无效，本实例此后一直视为不可用
+        self.auth_rejected = False
     
     def search(
         self,
         query: str,
         num_results: int = 10,
-        include_domains: Optional[List[str]] = None,
-        exclude_domains: Optional[List[str]] = None,
+        include_domains: Optional[Sequence[str]] = None,
+        exclude_domains: Optional[Sequence[str]] = None,
         start_crawl_date: Optional[str] = None,
         end_crawl_date: Optional[str] = None,
         start_published_date: Optional[str] = None,
         end_published_date: Optional[str] = None,
         use_autoprompt: bool = True,
-        type: str = "neural"
+        type: str = "neural",
+        contents: Optional[Dict[str, Any]] = None,
+        cache_ttl: Optional[float] = None
     ) -> Optional[Dict[str, Any]]:
         """
         执行搜索
@@ -86,9 +170,12 @@ class ExaSearchService:
             end_published_date: 结束发布日期 (YYYY-MM-DD)
             use_autoprompt: 是否使用自动提示优化查询
             type: 搜索类型 ('keyword', 'neural', 'magic')
+            contents: 随搜索结果一并返回的内容选项，如 {"summary": True, "highlights": True}，
+                省去单独调用 /contents 的一次往返
+            cache_ttl: 结果缓存有效期（秒），None 使用默认值，0 不缓存
             
         Returns:
-            搜索结果字典
+            搜索结果字典（命中缓存时返回共享对象，调用方不应修改）
         """
         try:
             payload = {
@@ -110,20 +197,29 @@ class ExaSearchService:
                 payload["startPublishedDate"] = start_published_date
             if end_published_date:
                 payload["endPublishedDate"] = end_published_date
+            if contents:
+                payload["contents"] = contents
+            
+            key = _payload_key("search", payload) if cache_ttl != 0 else None
+            if key is not None:
+                cached = _SEARCH_CACHE.get(key)
+                if cached is not None:
+                    return cached
             
             response = self.session.post(
                 f"{self.base_url}/search",
-                json=payload,
+                data=dumps_json(payload),
+                headers=self._auth_headers,
                 timeout=30
             )
             
-            if response.status_code == 429:
-                raise ExaSearchError("Exa API请求频率超限")
-            
-            response.raise_for_status()
-            return response.json()
+            self._raise_for_status(response)
+            result = loads_json(response.content)
+            if key is not None:
+                _SEARCH_CACHE.set(key, result, ttl=cache_ttl)
+            return result
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             raise ExaSearchError(f"Exa搜索请求失败: {str(e)}")
     
     def get_contents(
@@ -156,16 +252,27 @@ class ExaSearchService:
                 "livecrawl": livecrawl
             }
             
+            # 实时爬取的结果不缓存
+            key = _payload_key("contents", payload) if livecrawl != "always" else None
+            if key is not None:
+                cached = _CONTENTS_CACHE.get(key)
+                if cached is not None:
+                    return cached
+            
             response = self.session.post(
                 f"{self.base_url}/contents",
-                json=payload,
+                data=dumps_json(payload),
+                headers=self._auth_headers,
                 timeout=30
             )
             
-            response.raise_for_status()
-            return response.json()
+            self._raise_for_status(response)
+            result = loads_json(response.content)
+            if key is not None:
+                _CONTENTS_CACHE.set(key, result)
+            return result
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             raise ExaSearchError(f"Exa内容获取失败: {str(e)}")
     
     def find_similar(
@@ -197,14 +304,15 @@ class ExaSearchService:
             
             response = self.session.post(
                 f"{self.base_url}/findSimilar",
-                json=payload,
+                data=dumps_json(payload),
+                headers=self._auth_headers,
                 timeout=30
             )
             
-            response.raise_for_status()
-            return response.json()
+            self._raise_for_status(response)
+            return loads_json(response.content)
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             raise ExaSearchError(f"Exa相似内容查找失败: {str(e)}")
     
     def search_and_extract(
@@ -225,21 +333,21 @@ class ExaSearchService:
             结构化结果列表
         """
         try:
-            # 执行搜索
+            # 执行搜索（需要额外字段时摘要和高亮随搜索结果一并返回）
             search_result = self.search(
                 query=query,
                 num_results=num_results,
-                type="neural"
+                type="neural",
+                contents={"highlights": True, "summary": True} if extract_fields else None
             )
             
             if not search_result or "results" not in search_result:
                 return []
             
-            results = search_result["results"]
             extracted_data = []
             
             # 提取每个结果的关键信息
-            for item in results:
+            for item in search_result["results"]:
                 extracted_item = {
                     "title": item.get("title", ""),
                     "url": item.get("url", ""),
@@ -248,19 +356,9 @@ class ExaSearchService:
                     "author": item.get("author", "")
                 }
                 
-                # 如果需要额外字段，获取页面内容
                 if extract_fields:
-                    content_result = self.get_contents(
-                        urls=[item["url"]],
-                        text=False,
-                        highlights=True,
-                        summary=True
-                    )
-                    
-                    if content_result and "results" in content_result:
-                        content = content_result["results"][0]
-                        extracted_item["summary"] = content.get("summary", "")
-                        extracted_item["highlights"] = content.get("highlights", [])
+                    extracted_item["summary"] = item.get("summary", "")
+                    extracted_item["highlights"] = item.get("highlights", [])
                 
                 extracted_data.append(extracted_item)
             
@@ -299,36 +397,16 @@ class ExaSearchService:
             search_result = self.search(
                 query=query,
                 num_results=15,
-                include_domains=[
-                    "sina.com.cn",
-                    "163.com",
-                    "eastmoney.com",
-                    "cs.com.cn",
-                    "cnstock.com",
-                    "yicai.com",
-                    "caixin.com",
-                    "ftchinese.com"
-                ],
+                include_domains=_STOCK_DOMAINS,
                 start_published_date=start_date.strftime("%Y-%m-%d"),
                 end_published_date=end_date.strftime("%Y-%m-%d"),
-                type="neural"
+                type="neural",
+                contents={"summary": True}
             )
             
             if not search_result or "results" not in search_result:
                 return None
             
-            # 提取内容
-            urls = [item["url"] for item in search_result["results"][:5]]
-            if urls:
-                content_result = self.get_contents(
-                    urls=urls,
-                    text=False,
-                    highlights=True,
-                    summary=True
-                )
-            else:
-                content_result = None
-            
             # 整理结果
             intelligence_data = {
                 "stock_code": stock_code,
@@ -352,15 +430,14 @@ class ExaSearchService:
                     "published_date": item.get("publishedDate", "")
                 })
             
-            # 添加内容摘要
-            if content_result and "results" in content_result:
-                summaries = []
-                for content in content_result["results"]:
-                    if content.get("summary"):
-                        summaries.append(content["summary"])
-                
-                if summaries:
-                    intelligence_data["content_summary"] = "\n\n".join(summaries[:3])
+            # 添加内容摘要（取前5条结果，按搜索结果顺序）
+            summaries = [
+                item["summary"] for item in search_result["results"][:5]
+                if item.get("summary")
+            ]
+            
+            if summaries:
+                intelligence_data["content_summary"] = "\n\n".join(summaries[:3])
             
             return intelligence_data
             
@@ -383,31 +460,45 @@ class ExaSearchService:
         Returns:
             新闻列表
         """
-        try:
-            market_queries = {
-                "A股": "A股市场 最新动态 上证指数 深证成指 创业板指",
-                "港股": "港股市场 恒生指数 最新行情 港股通",
-                "美股": "美股市场 道琼斯 纳斯达克 标普500",
-                "全球": "全球股市 国际市场 金融市场 动态"
-            }
+        return self.search_market_news_multi([market], limit)[market]
+    
+    def search_market_news_multi(
+        self,
+        markets: List[str],
+        limit: int = 10
+    ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """
+        并发搜索多个市场的新闻
+        
+        Args:
+            markets: 市场类型列表 ('A股', '港股', '美股', '全球')
+            limit: 每个市场返回结果数量
             
-            query = market_queries.get(market, market_queries["A股"])
+        Returns:
+            市场 -> 新闻列表 的映射（单个市场失败时对应值为 None）
+        """
+        markets = list(dict.fromkeys(markets))
+        if len(markets) <= 1:
+            return {market: self._fetch_market_news(market, limit) for market in markets}
+        
+        with ThreadPoolExecutor(max_workers=len(markets), thread_name_prefix="exa-market") as executor:
+            futures = {
+                market: executor.submit(self._fetch_market_news, market, limit)
+                for market in markets
+            }
+            return {market: future.result() for market, future in futures.items()}
+    
+    def _fetch_market_news(self, market: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """搜索单个市场的新闻（异常时返回 None）"""
+        try:
+            query = _MARKET_QUERIES.get(market, _MARKET_QUERIES["A股"])
             
             search_result = self.search(
                 query=query,
                 num_results=limit,
-                include_domains=[
-                    "sina.com.cn",
-                    "163.com",
-                    "eastmoney.com",
-                    "cnstock.com",
-                    "yicai.com",
-                    "caixin.com",
-                    "ftchinese.com",
-                    "reuters.com",
-                    "bloomberg.com"
-                ],
-                type="neural"
+                include_domains=_MARKET_DOMAINS,
+                type="neural",
+                cache_ttl=120  # 市场新闻时效性强，缩短缓存时间
             )
             
             if not search_result or "results" not in search_result:
@@ -429,6 +520,18 @@ class ExaSearchService:
             logger.warning(f"市场新闻搜索失败 {market}: {e}")
             return None
     
+    def _mark_auth_rejected(self, status_code: int) -> None:
+        """记录 API Key 被拒绝（只在首次记录日志）"""
+        if not self.auth_rejected:
+            self.auth_rejected = True
+            logger.error(f"[Exa] API Key {self.api_key[:8]}... 认证失败（HTTP {status_code}），停止使用该 Key")
+    
+    def _raise_for_status(self, response: requests.Response) -> None:
+        """检查响应状态，401/403 时将本实例标记为不可用"""
+        if response.status_code in _AUTH_ERROR_CODES:
+            self._mark_auth_rejected(response.status_code)
+        response.raise_for_status()
+    
     def is_available(self) -> bool:
         """
         检查服务是否可用
@@ -436,9 +539,23 @@ class ExaSearchService:
         Returns:
             是否可用
         """
-        try:
-            # 简单的可用性检查
-            result = self.search("test", num_results=1)
-            return result is not None
-        except Exception:
+        if self.auth_rejected:
             return False
+        
+        checked_at, available = self._avail_cache
+        now = time.monotonic()
+        if checked_at and now - checked_at < _AVAIL_CACHE_TTL:
+            return available
+        
+        # 轻量探测：带密钥访问根地址，不消耗搜索额度；401/403、5xx 或网络异常视为不可用。
+        # 根地址不一定校验密钥，因此实际请求返回 401/403 时也会标记为不可用
+        try:
+            response = self.session.get(self.base_url, headers=self._auth_headers, timeout=3)
+            if response.status_code in _AUTH_ERROR_CODES:
+                self._mark_auth_rejected(response.status_code)
+            available = response.status_code < 500 and not self.auth_rejected
+        except requests.exceptions.RequestException:
+            available = False
+        
+        self._avail_cache = (now, available)
+        return available
@@ -7,14 +7,29 @@ Exa搜索提供者适配器
 将ExaSearchService适配为BaseSearchProvider接口
 """
 
+import functools
 import logging
+import re
+import threading
+from itertools import cycle
 from typing import List, Optional
-from .search_service import BaseSearchProvider, SearchResponse, SearchResult
+from .search_service import BaseSearchProvider, SearchResponse, SearchResult, get_env_positive_int
 from .exa_search import ExaSearchService, ExaSearchError
 
 logger = logging.getLogger(__name__)
 
 
+_DOMAIN_RE = re.compile(r"^https?://(?:www\.)?([^/:?#]+)", re.I)
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_domain(url: str) -> str:
+    """从URL提取域名（去掉 www. 前缀，结果缓存）"""
+    if not isinstance(url, str):
+        return "未知来源"
+    return m.group(1).lower() if (m := _DOMAIN_RE.match(url)) else "未知来源"
+
+
 class ExaSearchProviderAdapter(BaseSearchProvider):
     """
     Exa搜索提供者适配器
@@ -42,24 +57,32 @@ class ExaSearchProviderAdapter(BaseSearchProvider):
         
         if not self._exa_services:
             logger.error("[Exa] 没有可用的API Key")
+        
+        # 轮询迭代器，加锁保证多线程并发调用时不会重复/遗漏实例
+        self._service_cycle = cycle(self._exa_services) if self._exa_services else None
+        self._service_lock = threading.Lock()
+        # 限制同时发往 Exa 的请求数，并发超出时在进程内短暂排队，避免触发 429
+        self._search_slots = threading.BoundedSemaphore(get_env_positive_int("EXA_CONCURRENCY", 3))
     
     @property
     def is_available(self) -> bool:
-        """检查是否有可用的服务实例"""
-        return len(self._exa_services) > 0
+        """检查是否有可用的服务实例（API Key 被拒绝的实例不计入）"""
+        return any(not service.auth_rejected for service in self._exa_services)
     
     def _get_next_service(self) -> Optional[ExaSearchService]:
         """
         获取下一个可用的Exa服务实例（轮询）
         """
-        if not self._exa_services:
+        if not self._service_cycle:
             return None
         
-        # 简单轮询策略
-        service = self._exa_services[0]
-        # 将使用的service移到队尾实现轮询
-        self._exa_services = self._exa_services[1:] + [service]
-        return service
+        # 跳过 API Key 已被拒绝的实例
+        with self._service_lock:
+            for _ in range(len(self._exa_services)):
+                service = next(self._service_cycle)
+                if not service.auth_rejected:
+                    return service
+        return None
     
     def _do_search(self, query: str, api_key: str, max_results: int, days: int = 7) -> SearchResponse:
         """
@@ -74,78 +97,70 @@ class ExaSearchProviderAdapter(BaseSearchProvider):
         Returns:
             SearchResponse对象
         """
-        service = self._get_next_service()
-        if not service:
-            return SearchResponse(
-                query=query,
-                results=[],
-                provider=self.name,
-                success=False,
-                error_message="无可用的Exa服务实例"
-            )
-        
-        try:
-            # 使用Exa的搜索并提取功能
-            results = service.search_and_extract(
-                query=query,
-                num_results=max_results
-            )
-            
-            if not results:
+        with self._search_slots:
+            service = self._get_next_service()
+            if not service:
                 return SearchResponse(
                     query=query,
                     results=[],
                     provider=self.name,
                     success=False,
-                    error_message="搜索未返回结果"
+                    error_message="无可用的Exa服务实例"
                 )
             
-            # 转换为标准SearchResult格式
-            search_results = []
-            for item in results:
-                search_results.append(SearchResult(
-                    title=item.get("title", ""),
-                    snippet=item.get("summary", "")[:500],  # 截取摘要前500字符
-                    url=item.get("url", ""),
-                    source=self._extract_domain(item.get("url", "")),
-                    published_date=item.get("published_date", "")
-                ))
-            
-            return SearchResponse(
-                query=query,
-                results=search_results,
-                provider=self.name,
-                success=True
-            )
-            
-        except ExaSearchError as e:
-            error_msg = f"Exa搜索错误: {str(e)}"
-            logger.warning(f"[{self.name}] {error_msg}")
-            return SearchResponse(
-                query=query,
-                results=[],
-                provider=self.name,
-                success=False,
-                error_message=error_msg
-            )
-        except Exception as e:
-            error_msg = f"未知错误: {str(e)}"
-            logger.error(f"[{self.name}] {error_msg}")
-            return SearchResponse(
-                query=query,
-                results=[],
-                provider=self.name,
-                success=False,
-                error_message=error_msg
-            )
-    
-    @staticmethod
-    def _extract_domain(url: str) -> str:
-        """从URL提取域名"""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.replace('www.', '')
-            return domain or '未知来源'
-        except:
-            return '未知来源'
+            try:
+                # 使用Exa的搜索并提取功能
+                results = service.search_and_extract(
+                    query=query,
+                    num_results=max_results
+                )
+                
+                if not results:
+                    return SearchResponse(
+                        query=query,
+                        results=[],
+                        provider=self.name,
+                        success=False,
+                        error_message="搜索未返回结果"
+                    )
+                
+                # 转换为标准SearchResult格式
+                search_results = []
+                for item in results:
+                    # Exa 可能返回 null 字段，统一按空字符串处理，避免单条结果导致整体失败
+                    url = item.get("url") or ""
+                    search_results.append(SearchResult(
+                        title=item.get("title") or "",
+                        snippet=(item.get("summary") or "")[:500],  # 截取摘要前500字符
+                        url=url,
+                        source=_extract_domain(url),
+                        published_date=item.get("published_date", "")
+                    ))
+                
+                return SearchResponse(
+                    query=query,
+                    results=search_results,
+                    provider=self.name,
+                    success=True
+                )
+                
+            except ExaSearchError as e:
+                error_msg = f"Exa搜索错误: {str(e)}"
+                logger.warning(f"[{self.name}] {error_msg}")
+                return SearchResponse(
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    success=False,
+                    error_message=error_msg
+                )
+            except Exception as e:
+                error_msg = f"未知错误: {str(e)}"
+                logger.error(f"[{self.name}] {error_msg}")
+                return SearchResponse(
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    success=False,
+                    error_message=error_msg
+                )
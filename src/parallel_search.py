@@ -14,20 +14,105 @@
 """
 
 import asyncio
+import hashlib
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Callable, Any
-from datetime import datetime, timedelta
+import re
+import sys
+import time
+import unicodedata
+import weakref
+from dataclasses import dataclass, replace
+from itertools import zip_longest
+from typing import List, Dict, Optional, Callable, Any, Tuple
+from urllib.parse import urlsplit
 
-from src.search_service import SearchResponse, BaseSearchProvider
+import numpy as np
+
+from data_provider.http_utils import TTLCache
+from data_provider.realtime_types import CircuitBreaker
+from src.search_service import (
+    SearchResponse, SearchResult, BaseSearchProvider, get_search_executor, get_search_http_session
+)
 
 logger = logging.getLogger(__name__)
 
+# asyncio.TaskGroup / asyncio.timeout 自 Python 3.11 起提供
+_HAS_TASK_GROUP = sys.version_info >= (3, 11)
+
+# 重新检查引擎可用性的间隔（秒）
+_HEALTH_CHECK_INTERVAL = 60
+# 引擎熔断：连续失败（含超时）次数阈值与冷却时间（秒）
+_BREAKER_FAILURE_THRESHOLD = 3
+_BREAKER_COOLDOWN = 60.0
+
+
+# 标题归一化时去掉的空白与标点（含省略号）
+_TITLE_NOISE_RE = re.compile(r"[\W_]+")
+# SimHash 近似重复判定：64 位指纹，汉明距离 ≤ 3 视为重复；
+# 分成 4 段各 16 位建索引，距离 ≤ 3 的两个指纹必有一段完全相同
+_SIMHASH_MAX_DISTANCE = 3
+_SIMHASH_BANDS = 4
+_SIMHASH_BAND_BITS = 64 // _SIMHASH_BANDS
+_SIMHASH_MIN_TOKENS = 4
+
+
+def _normalize_title(title: str) -> str:
+    """标题归一化：NFKC + casefold，去掉空白和标点"""
+    return _TITLE_NOISE_RE.sub("", unicodedata.normalize("NFKC", title).casefold())
+
+
+def _url_host(url: str) -> str:
+    """URL 主机名（小写，去掉 www. 前缀）"""
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
 
-@dataclass
+
+def _simhash(text: str) -> Optional[int]:
+    """
+    计算文本的 64 位 SimHash（按字符二元组切分，兼顾中英文标题）
+    
+    各二元组哈希的逐位投票用 NumPy 一次完成，避免 Python 层的 64 次位循环。
+    文本过短时返回 None，不参与近似重复判定以免误杀。
+    """
+    tokens = {text[i:i + 2] for i in range(len(text) - 1)}
+    if len(tokens) < _SIMHASH_MIN_TOKENS:
+        return None
+    digests = b"".join(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest() for token in tokens
+    )
+    # (token 数, 64) 的位矩阵，列按大端位序排列；多数为 1 的位在指纹中置 1
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+    votes = bits.sum(axis=0) * 2 > len(tokens)
+    return int.from_bytes(np.packbits(votes).tobytes(), "big")
+
+
+class _NearDuplicateIndex:
+    """SimHash 分段索引，用于快速查找汉明距离相近的已见指纹"""
+    
+    def __init__(self):
+        self._bands: Dict[Tuple[int, int], List[int]] = {}
+    
+    def _band_keys(self, fingerprint: int):
+        mask = (1 << _SIMHASH_BAND_BITS) - 1
+        for band in range(_SIMHASH_BANDS):
+            yield band, (fingerprint >> (band * _SIMHASH_BAND_BITS)) & mask
+    
+    def seen(self, fingerprint: int) -> bool:
+        """是否已有近似重复的指纹"""
+        for key in self._band_keys(fingerprint):
+            for other in self._bands.get(key, ()):
+                if bin(fingerprint ^ other).count("1") <= _SIMHASH_MAX_DISTANCE:
+                    return True
+        return False
+    
+    def add(self, fingerprint: int) -> None:
+        for key in self._band_keys(fingerprint):
+            self._bands.setdefault(key, []).append(fingerprint)
+
+
+@dataclass(slots=True, frozen=True)
 class ParallelSearchResult:
-    """并行搜索结果"""
+    """并行搜索结果（字段不可重新赋值；缓存中保存的是副本，调用方可修改返回的列表和字典）"""
     query: str
     results: List[Dict[str, Any]]
     providers_used: List[str]
@@ -48,19 +133,50 @@ class ParallelSearchService:
     - 超时控制
     """
     
-    def __init__(self, providers: List[BaseSearchProvider], max_workers: int = 3):
+    def __init__(
+        self,
+        providers: List[BaseSearchProvider],
+        max_workers: int = 3,
+        cache_ttl: float = 120,
+        cache_size: int = 1024
+    ):
         """
         初始化并行搜索服务
         
         Args:
             providers: 搜索提供者列表
             max_workers: 最大并发数
+            cache_ttl: 搜索结果缓存有效期（秒），0 表示不缓存
+            cache_size: 结果缓存最大条目数
         """
-        self.providers = [p for p in providers if p.is_available]
-        self.max_workers = min(max_workers, len(self.providers))
-        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # 保留全部引擎，定期重新筛选可用的引擎（is_available 可能随时间变化）
+        self._all_providers: Tuple[BaseSearchProvider, ...] = tuple(providers)
+        self.providers: Tuple[BaseSearchProvider, ...] = tuple(p for p in providers if p.is_available)
+        self._last_health_check = time.monotonic()
+        # 按引擎熔断：连续失败的引擎在冷却期内直接跳过，不再占用并发名额和超时预算
+        self._breaker = CircuitBreaker(
+            failure_threshold=_BREAKER_FAILURE_THRESHOLD,
+            cooldown_seconds=_BREAKER_COOLDOWN
+        )
+        # 所有引擎共用一个 HTTP 连接池（进程共享，随进程退出关闭）
+        self._http = get_search_http_session()
+        for provider in self._all_providers:
+            provider.set_http_session(self._http)
+        # 按全部引擎计算上限：之后恢复可用的引擎也能获得并发名额（实际并发不超过可用引擎数）
+        self.max_workers = min(max_workers, len(self._all_providers))
+        # 使用进程共享的搜索线程池，反复创建服务实例不会新增线程
+        self.executor = get_search_executor()
+        # 异步路径的并发上限：每个事件循环一个信号量，超出的请求在协程层排队（可随超时取消）
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # 进行中的异步搜索：(query, max_results) -> Task，并发的相同请求共用一次执行
+        self._inflight: Dict[Tuple[str, int], "asyncio.Task[ParallelSearchResult]"] = {}
+        # 搜索结果缓存（同步/异步接口共用，TTLCache 自带线程锁）
+        self.cache_ttl = cache_ttl
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_ttl > 0 else None
         
-        logger.info(f"[并行搜索] 初始化完成，可用引擎: {[p.name for p in self.providers]}, 并发数: {self.max_workers}")
+        logger.info("[并行搜索] 初始化完成，可用引擎: %s, 并发数: %d", [p.name for p in self.providers], self.max_workers)
     
     def search_parallel(
         self,
@@ -69,7 +185,9 @@ class ParallelSearchService:
         timeout: float = 30.0
     ) -> ParallelSearchResult:
         """
-        并行搜索
+        并行搜索（同步接口，内部运行异步实现）
+        
+        不能在已运行的事件循环中调用，异步代码请直接 await search_parallel_async()。
         
         Args:
             query: 搜索查询
@@ -79,68 +197,7 @@ class ParallelSearchService:
         Returns:
             并行搜索结果
         """
-        start_time = datetime.now()
-        
-        if not self.providers:
-            return ParallelSearchResult(
-                query=query,
-                results=[],
-                providers_used=[],
-                success_count=0,
-                failed_providers=[],
-                execution_time=0.0,
-                merged_results=[]
-            )
-        
-        # 并行执行所有可用引擎
-        futures = {}
-        for provider in self.providers:
-            future = self.executor.submit(
-                self._search_single_provider,
-                provider,
-                query,
-                max_results
-            )
-            futures[future] = provider.name
-        
-        # 收集结果
-        results = []
-        providers_used = []
-        failed_providers = []
-        
-        for future in as_completed(futures, timeout=timeout):
-            provider_name = futures[future]
-            try:
-                result = future.result(timeout=timeout)
-                if result and result.success:
-                    results.append(result.to_dict())
-                    providers_used.append(provider_name)
-                    logger.info(f"[并行搜索] {provider_name} 搜索成功，获得 {len(result.results)} 条结果")
-                else:
-                    failed_providers.append(provider_name)
-                    logger.warning(f"[并行搜索] {provider_name} 搜索失败")
-            except Exception as e:
-                failed_providers.append(provider_name)
-                logger.error(f"[并行搜索] {provider_name} 执行异常: {e}")
-        
-        # 计算执行时间
-        execution_time = (datetime.now() - start_time).total_seconds()
-        
-        # 合并结果（简单去重）
-        merged_results = self._merge_results(results, max_results)
-        
-        logger.info(f"[并行搜索] 完成 - 成功: {len(providers_used)}, 失败: {len(failed_providers)}, "
-                   f"总结果: {len(merged_results)}, 耗时: {execution_time:.2f}s")
-        
-        return ParallelSearchResult(
-            query=query,
-            results=results,
-            providers_used=providers_used,
-            success_count=len(providers_used),
-            failed_providers=failed_providers,
-            execution_time=execution_time,
-            merged_results=merged_results
-        )
+        return asyncio.run(self.search_parallel_async(query, max_results, timeout))
     
     async def search_parallel_async(
         self,
@@ -159,7 +216,38 @@ class ParallelSearchService:
         Returns:
             并行搜索结果
         """
-        start_time = datetime.now()
+        cached = self._get_cached(query, max_results)
+        if cached is not None:
+            return cached
+        
+        key = (query, max_results)
+        loop = asyncio.get_running_loop()
+        
+        # 同一事件循环中已有相同请求在执行时直接等待其结果（single-flight），
+        # 检查与登记之间没有 await，无需额外加锁
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._search_parallel_async(query, max_results, timeout))
+            self._inflight[key] = task
+            
+            def _release(done: "asyncio.Task[ParallelSearchResult]") -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            
+            task.add_done_callback(_release)
+        
+        # shield：某个等待方被取消时不影响共用同一任务的其他调用方
+        return await asyncio.shield(task)
+    
+    async def _search_parallel_async(
+        self,
+        query: str,
+        max_results: int,
+        timeout: float
+    ) -> ParallelSearchResult:
+        """执行一次异步并行搜索（不做请求合并）"""
+        start_time = time.perf_counter()
+        self._refresh_providers()
         
         if not self.providers:
             return ParallelSearchResult(
@@ -172,79 +260,229 @@ class ParallelSearchService:
                 merged_results=[]
             )
         
-        # 创建异步任务
-        tasks = []
-        for provider in self.providers:
-            task = asyncio.create_task(
-                self._search_single_provider_async(provider, query, max_results)
-            )
-            tasks.append((task, provider.name))
-        
-        # 等待所有任务完成
-        results = []
+        responses: List[Tuple[str, SearchResponse]] = []
         providers_used = []
         failed_providers = []
         
-        done, pending = await asyncio.wait(
-            [task for task, _ in tasks],
-            timeout=timeout,
-            return_when=asyncio.ALL_COMPLETED
-        )
+        # 熔断中的引擎直接记为失败，不发起请求
+        active = []
+        for provider in self.providers:
+            if self._breaker.is_available(provider.name):
+                active.append(provider)
+            else:
+                failed_providers.append(provider.name)
+                logger.warning("[并行搜索] %s 熔断中，跳过", provider.name)
+        
+        outcomes, remaining = await self._run_providers_async(active, query, max_results, timeout)
         
-        # 处理完成的任务
-        for task, provider_name in tasks:
-            if task in done:
-                try:
-                    result = task.result()
-                    if result and result.success:
-                        results.append(result.to_dict())
-                        providers_used.append(provider_name)
-                        logger.info(f"[并行搜索] {provider_name} 搜索成功，获得 {len(result.results)} 条结果")
-                    else:
-                        failed_providers.append(provider_name)
-                        logger.warning(f"[并行搜索] {provider_name} 搜索失败")
-                except Exception as e:
-                    failed_providers.append(provider_name)
-                    logger.error(f"[并行搜索] {provider_name} 执行异常: {e}")
+        # 按完成先后处理各引擎结果
+        for provider_name, result, timed_out in outcomes:
+            if result and result.success:
+                responses.append((provider_name, result))
+                providers_used.append(provider_name)
+                self._breaker.record_success(provider_name)
+                logger.info("[并行搜索] %s 搜索成功，获得 %d 条结果", provider_name, len(result.results))
+            elif timed_out:
+                failed_providers.append(provider_name)
+                self._breaker.record_failure(provider_name, "超时")
+                logger.warning("[并行搜索] %s 超时", provider_name)
             else:
                 failed_providers.append(provider_name)
-                logger.warning(f"[并行搜索] {provider_name} 超时")
+                self._breaker.record_failure(provider_name, result.error_message if result else None)
+                logger.warning("[并行搜索] %s 搜索失败", provider_name)
         
-        # 取消未完成的任务
-        for task in pending:
-            task.cancel()
+        # 总体超时：尚未返回的引擎全部记为超时
+        for provider_name in remaining:
+            failed_providers.append(provider_name)
+            self._breaker.record_failure(provider_name, "超时")
+            logger.warning("[并行搜索] %s 超时", provider_name)
         
         # 计算执行时间
-        execution_time = (datetime.now() - start_time).total_seconds()
+        execution_time = time.perf_counter() - start_time
         
         # 合并结果
-        merged_results = self._merge_results(results, max_results)
+        merged_results = self._merge_results(responses, max_results)
+        
+        logger.info("[并行搜索] 完成 - 成功: %d, 失败: %d, 总结果: %d, 耗时: %.2fs",
+                    len(providers_used), len(failed_providers), len(merged_results), execution_time)
         
-        logger.info(f"[并行搜索] 完成 - 成功: {len(providers_used)}, 失败: {len(failed_providers)}, "
-                   f"总结果: {len(merged_results)}, 耗时: {execution_time:.2f}s")
+        # 每个响应只转换一次；合并结果直接复制已转换的条目（按 id 查找），不再逐字段重建
+        response_dicts = [response.to_dict() for _, response in responses]
+        item_dicts = {
+            id(item): item_dict
+            for (_, response), response_dict in zip(responses, response_dicts)
+            for item, item_dict in zip(response.results, response_dict["results"])
+        }
         
-        return ParallelSearchResult(
+        result = ParallelSearchResult(
             query=query,
-            results=results,
+            results=response_dicts,
             providers_used=providers_used,
             success_count=len(providers_used),
             failed_providers=failed_providers,
             execution_time=execution_time,
-            merged_results=merged_results
+            merged_results=[dict(item_dicts[id(item)]) for item in merged_results]
         )
+        self._store_cached(query, max_results, result)
+        return result
+    
+    async def _run_providers_async(
+        self,
+        providers: List[BaseSearchProvider],
+        query: str,
+        max_results: int,
+        timeout: float
+    ) -> Tuple[List[Tuple[str, Optional[SearchResponse], bool]], List[str]]:
+        """
+        并发执行给定引擎的搜索，总体超时后取消并等待未完成的任务结束
+        
+        Python 3.11+ 使用 TaskGroup + asyncio.timeout 做结构化取消；
+        3.10 回退为 as_completed + 手动 cancel/gather。
+        
+        Returns:
+            (按完成先后排列的 (引擎名称, 搜索响应, 是否超时) 列表, 总体超时时仍未返回的引擎名称)
+        """
+        outcomes: List[Tuple[str, Optional[SearchResponse], bool]] = []
+        
+        if _HAS_TASK_GROUP:
+            def _collect(task: "asyncio.Task") -> None:
+                if not task.cancelled() and task.exception() is None:
+                    outcomes.append(task.result())
+            
+            try:
+                async with asyncio.timeout(timeout):
+                    async with asyncio.TaskGroup() as tg:
+                        for provider in providers:
+                            task = tg.create_task(self._search_with_timeout(provider, query, max_results, timeout))
+                            task.add_done_callback(_collect)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            tasks = [
+                asyncio.create_task(self._search_with_timeout(provider, query, max_results, timeout))
+                for provider in providers
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks, timeout=timeout):
+                    outcomes.append(await next_done)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        
+        remaining = [provider.name for provider in providers]
+        for provider_name, _, _ in outcomes:
+            remaining.remove(provider_name)
+        return outcomes, remaining
     
-    def _search_single_provider(
+    async def _search_with_timeout(
         self,
         provider: BaseSearchProvider,
         query: str,
-        max_results: int
-    ) -> Optional[SearchResponse]:
-        """单个提供者搜索（同步版本）"""
+        max_results: int,
+        timeout: float
+    ) -> Tuple[str, Optional[SearchResponse], bool]:
+        """
+        带单独超时的异步搜索
+        
+        超时取总体超时与引擎自身 timeout 属性（如有）中的较小值，避免单个
+        卡住的引擎耗尽整体时间预算。
+        
+        Returns:
+            (引擎名称, 搜索响应, 是否超时)
+        """
+        per_provider_timeout = min(timeout, getattr(provider, "timeout", None) or timeout)
         try:
-            return provider.search(query, max_results)
-        except Exception as e:
-            logger.error(f"[并行搜索] {provider.name} 搜索异常: {e}")
+            result = await asyncio.wait_for(
+                self._search_single_provider_async(provider, query, max_results),
+                timeout=per_provider_timeout
+            )
+            return provider.name, result, False
+        except asyncio.TimeoutError:
+            return provider.name, None, True
+    
+    @staticmethod
+    def _cache_key(query: str, max_results: int) -> bytes:
+        """结果缓存键"""
+        return hashlib.blake2b(f"{query}|{max_results}".encode("utf-8"), digest_size=16).digest()
+    
+    @staticmethod
+    def _copy_result(result: ParallelSearchResult) -> ParallelSearchResult:
+        """
+        复制搜索结果中的列表和字典（字典的值都是不可变类型，复制到这一层即与原结果完全独立）
+        """
+        return replace(
+            result,
+            results=[
+                {**response, "results": [dict(item) for item in response["results"]]}
+                for response in result.results
+            ],
+            providers_used=list(result.providers_used),
+            failed_providers=list(result.failed_providers),
+            merged_results=[dict(item) for item in result.merged_results]
+        )
+    
+    def _get_cached(self, query: str, max_results: int) -> Optional[ParallelSearchResult]:
+        """
+        读取缓存的搜索结果
+        
+        返回副本，调用方修改结果（包括其中的字典）不会污染缓存。
+        """
+        if self._cache is None:
+            return None
+        cached = self._cache.get(self._cache_key(query, max_results))
+        if cached is None:
             return None
+        logger.debug("[并行搜索] 命中缓存: '%s'", query)
+        return self._copy_result(cached)
+    
+    def _store_cached(self, query: str, max_results: int, result: ParallelSearchResult) -> None:
+        """
+        缓存搜索结果的副本（全部引擎失败时不缓存，下次重新请求）
+        
+        缓存副本而不是返回给调用方的对象，调用方之后修改结果不会影响缓存。
+        """
+        if self._cache is not None and result.success_count:
+            self._cache.set(self._cache_key(query, max_results), self._copy_result(result))
+    
+    def _refresh_providers(self) -> None:
+        """距上次检查超过 _HEALTH_CHECK_INTERVAL 秒时重新筛选可用的引擎"""
+        now = time.monotonic()
+        if now - self._last_health_check < _HEALTH_CHECK_INTERVAL:
+            return
+        self._last_health_check = now
+        providers = tuple(p for p in self._all_providers if p.is_available)
+        if providers != self.providers:
+            logger.info("[并行搜索] 可用引擎变化: %s -> %s",
+                        [p.name for p in self.providers], [p.name for p in providers])
+            self.providers = providers
+    
+    def get_provider_health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各引擎健康状态（便于监控）
+        
+        Returns:
+            {引擎名称: {"available": 是否可用, "circuit": 熔断器状态(closed/open/half_open)}}
+        """
+        circuit = self._breaker.get_status()
+        available = {p.name for p in self.providers}
+        return {
+            p.name: {
+                "available": p.name in available,
+                "circuit": circuit.get(p.name, CircuitBreaker.CLOSED)
+            }
+            for p in self._all_providers
+        }
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """当前事件循环的并发信号量（asyncio 原语不能跨事件循环复用）"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(max(1, self.max_workers))
+        return semaphore
     
     async def _search_single_provider_async(
         self,
@@ -254,69 +492,82 @@ class ParallelSearchService:
     ) -> Optional[SearchResponse]:
         """单个提供者搜索（异步版本）"""
         try:
-            # 在线程池中执行同步调用
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                self.executor,
-                provider.search,
-                query,
-                max_results
-            )
+            async with self._get_semaphore():
+                # 原生异步引擎直接 await；同步引擎由基类放入本服务的线程池执行
+                return await provider.search_async(query, max_results, executor=self.executor)
         except Exception as e:
-            logger.error(f"[并行搜索] {provider.name} 搜索异常: {e}")
+            logger.error("[并行搜索] %s 搜索异常: %s", provider.name, e)
             return None
     
     def _merge_results(
         self,
-        results: List[Dict],
+        responses: List[Tuple[str, SearchResponse]],
         max_results: int
-    ) -> List[Dict[str, Any]]:
+    ) -> List[SearchResult]:
         """
         合并多个搜索结果，去除重复项
         
+        直接引用各引擎返回的 SearchResult，按引擎轮流流式读取，字典转换只在生成最终结果时进行。
+        
         Args:
-            results: 多个引擎的结果列表
+            responses: 各引擎的 (名称, 响应) 列表
             max_results: 最大返回结果数
             
         Returns:
             合并后的结果列表
         """
-        if not results:
+        # 结果数不会超过各引擎结果总数，按上限一次分配，不再生成中间列表
+        limit = min(max_results, sum(len(response.results) for _, response in responses))
+        if limit <= 0:
             return []
         
-        # 收集所有结果
-        all_items = []
-        for result_dict in results:
-            items = result_dict.get('results', [])
-            all_items.extend(items)
+        # 去重：归一化标题 + 站点 精确去重，再用标题 SimHash 过滤改写过的近似标题
+        seen_keys = set()
+        near_duplicates = _NearDuplicateIndex()
+        unique_items: List[Optional[SearchResult]] = [None] * limit
+        n = 0
         
-        if not all_items:
-            return []
-        
-        # 基于标题去重（简单策略）
-        seen_titles = set()
-        unique_items = []
+        # 各引擎结果轮流取（第 1 名、第 2 名……），截断时每个引擎的靠前结果都能入选；
+        # SearchResult 没有统一的相关性分数，因此不做按分数的多路归并
+        interleaved = (
+            item
+            for row in zip_longest(*(response.results for _, response in responses))
+            for item in row
+            if item is not None
+        )
         
-        for item in all_items:
-            title = item.get('title', '').strip()
-            if title and title not in seen_titles:
-                seen_titles.add(title)
-                unique_items.append(item)
-                if len(unique_items) >= max_results:
-                    break
+        for item in interleaved:
+            title = _normalize_title(item.title or '')
+            if not title:
+                continue
+            key = hashlib.blake2b(
+                f"{title}\x00{_url_host(item.url or '')}".encode("utf-8"), digest_size=8
+            ).digest()
+            if key in seen_keys:
+                continue
+            fingerprint = _simhash(title)
+            if fingerprint is not None:
+                if near_duplicates.seen(fingerprint):
+                    continue
+                near_duplicates.add(fingerprint)
+            seen_keys.add(key)
+            unique_items[n] = item
+            n += 1
+            if n == limit:
+                break
         
-        return unique_items[:max_results]
+        return unique_items[:n]
     
     def close(self):
-        """关闭资源"""
-        self.executor.shutdown(wait=True)
+        """关闭资源（线程池为进程共享，随进程退出统一关闭，这里不做 shutdown）"""
         logger.info("[并行搜索] 服务已关闭")
 
 
 # 便捷函数
 def create_parallel_search_service(
     providers: List[BaseSearchProvider],
-    max_workers: int = 3
+    max_workers: int = 3,
+    cache_ttl: float = 120
 ) -> ParallelSearchService:
     """
     创建并行搜索服务实例
@@ -324,8 +575,9 @@ def create_parallel_search_service(
     Args:
         providers: 搜索提供者列表
         max_workers: 最大并发数
+        cache_ttl: 搜索结果缓存有效期（秒），0 表示不缓存
         
     Returns:
         并行搜索服务实例
     """
-    return ParallelSearchService(providers, max_workers)
+    return ParallelSearchService(providers, max_workers, cache_ttl=cache_ttl)
@@ -13,26 +13,75 @@ A股自选股智能分析系统 - 搜索服务模块
 6. 智能结果合并与去重
 """
 
+import asyncio
+import atexit
+import functools
 import logging
+import os
 import random
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from itertools import cycle
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 import requests
-from newspaper import Article, Config
+
+from data_provider.http_utils import get_shared_session
 
 logger = logging.getLogger(__name__)
 
 
+def get_env_positive_int(name: str, default: int) -> int:
+    """
+    读取正整数环境变量
+    
+    非数字或小于 1 的值（如 0 会让线程池/信号量无法工作）记录告警并回退到默认值。
+    """
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        parsed = 0
+    if parsed < 1:
+        logger.warning(f"环境变量 {name}={value!r} 无效（需为正整数），使用默认值 {default}")
+        return default
+    return parsed
+
+
+# 多源并行搜索共用的线程池：线程常驻，复用各引擎会话中的长连接
+_SEARCH_POOL = ThreadPoolExecutor(
+    max_workers=get_env_positive_int("PSEARCH_WORKERS", 16),
+    thread_name_prefix="psearch"
+)
+atexit.register(_SEARCH_POOL.shutdown, wait=False, cancel_futures=True)
+
+
+def get_search_http_session() -> requests.Session:
+    """获取各搜索引擎共用的 HTTP 会话（按进程共享连接池）"""
+    return get_shared_session("search-providers", pool_connections=16, pool_maxsize=32)
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """获取进程共享的搜索线程池（不要自行 shutdown）"""
+    return _SEARCH_POOL
+
+
+# 新闻搜索时间范围（天），按星期几索引：周一覆盖周末取 3 天，周末取 2 天，其余 1 天
+_WEEKDAY_DAYS = (3, 1, 1, 1, 1, 2, 2)
+
+
 def fetch_url_content(url: str, timeout: int = 5) -> str:
     """
     获取 URL 网页正文内容 (使用 newspaper3k)
     """
     try:
+        # newspaper3k 导入较慢（依赖 lxml/nltk 等），仅在真正抓取正文时加载
+        from newspaper import Article, Config
+        
         # 配置 newspaper3k
         config = Config()
         config.browser_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -67,6 +116,10 @@ class SearchResult:
     source: str  # 来源网站
     published_date: Optional[str] = None
     
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（每次返回新字典，调用方可自由修改）"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+    
     def to_text(self) -> str:
         """转换为文本格式"""
         date_str = f" ({self.published_date})" if self.published_date else ""
@@ -83,6 +136,12 @@ class SearchResponse:
     error_message: Optional[str] = None
     search_time: float = 0.0  # 搜索耗时（秒）
     
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（每次返回新字典，调用方可自由修改）"""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data["results"] = [result.to_dict() for result in self.results]
+        return data
+    
     def to_context(self, max_results: int = 5) -> str:
         """将搜索结果转换为可用于 AI 分析的上下文"""
         if not self.success or not self.results:
@@ -141,6 +200,7 @@ class BaseSearchProvider(ABC):
         self._key_cycle = cycle(api_keys) if api_keys else None
         self._key_usage: Dict[str, int] = {key: 0 for key in api_keys}
         self._key_errors: Dict[str, int] = {key: 0 for key in api_keys}
+        self._http_session: Optional[requests.Session] = None
     
     @property
     def name(self) -> str:
@@ -151,6 +211,22 @@ class BaseSearchProvider(ABC):
         """检查是否有可用的 API Key"""
         return bool(self._api_keys)
     
+    def set_http_session(self, session: requests.Session) -> None:
+        """
+        注入共享的 HTTP 会话
+        
+        多个引擎共用同一连接池，复用 TCP/TLS 连接；使用自带 SDK 客户端
+        （Tavily、SerpAPI）或自有会话（Exa）的引擎不受影响。
+        """
+        self._http_session = session
+    
+    @property
+    def http_session(self) -> requests.Session:
+        """直接发起 HTTP 请求时使用的会话（未注入时使用进程共享的搜索会话）"""
+        if self._http_session is None:
+            self._http_session = get_search_http_session()
+        return self._http_session
+    
     def _get_next_key(self) -> Optional[str]:
         """
         获取下一个可用的 API Key（负载均衡）
@@ -236,6 +312,31 @@ class BaseSearchProvider(ABC):
                 error_message=str(e),
                 search_time=elapsed
             )
+    
+    async def search_async(
+        self,
+        query: str,
+        max_results: int = 5,
+        days: int = 7,
+        executor: Optional[Executor] = None
+    ) -> SearchResponse:
+        """
+        异步执行搜索
+        
+        默认在线程池中运行同步的 search()；支持原生异步 HTTP 的引擎可覆盖此方法，
+        并行搜索服务会直接 await，无需为其占用线程。
+        
+        Args:
+            query: 搜索关键词
+            max_results: 最大返回结果数
+            days: 搜索最近几天的时间范围
+            executor: 执行同步搜索的线程池（默认使用模块共享线程池）
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor or _SEARCH_POOL,
+            functools.partial(self.search, query, max_results, days)
+        )
 
 
 class TavilySearchProvider(BaseSearchProvider):
@@ -549,17 +650,6 @@ class BochaSearchProvider(BaseSearchProvider):
     
     def _do_search(self, query: str, api_key: str, max_results: int, days: int = 7) -> SearchResponse:
         """执行博查搜索"""
-        try:
-            import requests
-        except ImportError:
-            return SearchResponse(
-                query=query,
-                results=[],
-                provider=self.name,
-                success=False,
-                error_message="requests 未安装，请运行: pip install requests"
-            )
-        
         try:
             # API 端点
             url = "https://api.bocha.cn/v1/web-search"
@@ -590,7 +680,7 @@ class BochaSearchProvider(BaseSearchProvider):
             }
             
             # 执行搜索
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
+            response = self.http_session.post(url, headers=headers, json=payload, timeout=10)
             
             # 检查HTTP状态码
             if response.status_code != 200:
@@ -832,41 +922,58 @@ class SearchService:
         
         logger.info(f"[并行搜索] 启动多源搜索: '{query}'，使用 {len(available_providers)} 个搜索引擎")
         
-        # 并行执行所有搜索引擎
-        provider_details = {}
-        providers_used = []
+        # 并行执行所有搜索引擎（按提交顺序预留位置，保证输出顺序稳定）
+        provider_details: Dict[str, Optional[SearchResponse]] = dict.fromkeys(
+            (p.name for p in available_providers), None
+        )
         
-        with ThreadPoolExecutor(max_workers=min(len(available_providers), self.max_concurrent_searches)) as executor:
-            # 提交所有搜索任务
-            future_to_provider = {
-                executor.submit(provider.search, query, max_results_per_engine, days): provider
-                for provider in available_providers
-            }
-            
-            # 收集结果
-            for future in as_completed(future_to_provider):
-                provider = future_to_provider[future]
-                try:
-                    response = future.result()
-                    provider_details[provider.name] = response
-                    providers_used.append(provider.name)
+        # 收集到足够多的去重结果后不再等待较慢的引擎（约为最快两个引擎的满额结果）
+        target_unique = max_results_per_engine * min(2, len(available_providers))
+        unique_urls = set()
+        
+        # 提交所有搜索任务
+        future_to_provider = {
+            _SEARCH_POOL.submit(provider.search, query, max_results_per_engine, days): provider
+            for provider in available_providers
+        }
+        
+        # 收集结果
+        for future in as_completed(future_to_provider):
+            provider = future_to_provider[future]
+            try:
+                response = future.result()
+                provider_details[provider.name] = response
+                
+                if response.success:
+                    logger.info(f"[{provider.name}] 搜索完成，返回 {len(response.results)} 条结果，耗时 {response.search_time:.2f}s")
+                    unique_urls.update(r.url.lower().strip() for r in response.results if r.url)
+                else:
+                    logger.warning(f"[{provider.name}] 搜索失败: {response.error_message}")
                     
-                    if response.success:
-                        logger.info(f"[{provider.name}] 搜索完成，返回 {len(response.results)} 条结果，耗时 {response.search_time:.2f}s")
-                    else:
-                        logger.warning(f"[{provider.name}] 搜索失败: {response.error_message}")
-                        
-                except Exception as e:
-                    error_response = SearchResponse(
-                        query=query,
-                        results=[],
-                        provider=provider.name,
-                        success=False,
-                        error_message=str(e)
-                    )
-                    provider_details[provider.name] = error_response
-                    providers_used.append(provider.name)
-                    logger.error(f"[{provider.name}] 搜索异常: {e}")
+            except Exception as e:
+                error_response = SearchResponse(
+                    query=query,
+                    results=[],
+                    provider=provider.name,
+                    success=False,
+                    error_message=str(e)
+                )
+                provider_details[provider.name] = error_response
+                logger.error(f"[{provider.name}] 搜索异常: {e}")
+            
+            if len(unique_urls) >= target_unique:
+                pending = [f for f in future_to_provider if not f.done()]
+                if pending:
+                    # 尚未开始的任务直接取消，已在执行的请求由线程池后台完成
+                    for f in pending:
+                        f.cancel()
+                    logger.info(f"[并行搜索] 已获得 {len(unique_urls)} 条去重结果，"
+                                f"不再等待其余 {len(pending)} 个搜索引擎")
+                break
+        
+        # 提前结束时未返回的引擎不计入结果
+        provider_details = {name: r for name, r in provider_details.items() if r is not None}
+        providers_used = list(provider_details)
         
         # 合并结果
         merged_results, merge_stats = self._merge_search_results(
@@ -917,15 +1024,13 @@ class SearchService:
         
         # 根据策略合并
         if strategy == "dedupe_by_url":
-            # 按URL去重，保留最早出现的结果
-            seen_urls = set()
-            deduped_results = []
-            
+            # 按URL去重，保留最早出现的结果（dict 保持插入顺序）
+            keyed: Dict[str, SearchResult] = {}
             for result in all_results:
                 url_key = result.url.lower().strip()
-                if url_key and url_key not in seen_urls:
-                    seen_urls.add(url_key)
-                    deduped_results.append(result)
+                if url_key and url_key not in keyed:
+                    keyed[url_key] = result
+            deduped_results = list(keyed.values())
             
             logger.info(f"[结果合并] 去重前: {len(all_results)} 条，去重后: {len(deduped_results)} 条")
             return deduped_results, source_stats
@@ -949,62 +1054,37 @@ class SearchService:
         max_results: int = 5,
         focus_keywords: Optional[List[str]] = None
     ) -> SearchResponse:
-       """
-       搜索股票相关新闻
-           
-       Args:
-           stock_code: 股票代码
-           stock_name: 股票名称
-           max_results: 最大返回结果数
-           focus_keywords: 重点关注的关键词列表
-               
-       Returns:
-           SearchResponse 对象
-       """
-       # 智能确定搜索时间范围
-       # 策略：
-       # 1. 周二至周五：搜索近1天（24小时）
-       # 2. 周六、周日：搜索近2-3天（覆盖周末）
-       # 3. 周一：搜索近3天（覆盖周末）
-       today_weekday = datetime.now().weekday()
-       if today_weekday == 0: # 周一
-           search_days = 3
-       elif today_weekday >= 5: # 周六(5)、周日(6)
-           search_days = 2
-       else: # 周二(1) - 周五(4)
-           search_days = 1
-   
-       # 构建搜索查询（优化搜索效果）
-       if focus_keywords:
-           # 如果提供了关键词，直接使用关键词作为查询
-           query = " ".join(focus_keywords)
-       else:
-           # 默认主查询：股票名称 + 核心关键词
-           query = f"{stock_name} {stock_code} 股票 最新消息"
-   
-       logger.info(f"搜索股票新闻: {stock_name}({stock_code}), query='{query}', 时间范围: 近{search_days}天")
-           
-       # 依次尝试各个搜索引擎
-       for provider in self._providers:
-           if not provider.is_available:
-               continue
-               
-           response = provider.search(query, max_results, days=search_days)
-               
-           if response.success and response.results:
-               logger.info(f"使用 {provider.name} 搜索成功")
-               return response
-           else:
-               logger.warning(f"{provider.name} 搜索失败: {response.error_message}，尝试下一个引擎")
-           
-        # 所有引擎都失败
-        return SearchResponse(
-            query=query,
-            results=[],
-            provider="None",
-            success=False,
-            error_message="所有搜索引擎均不可用或搜索失败"
-        )
+        """
+        搜索股票相关新闻
+        
+        Args:
+            stock_code: 股票代码
+            stock_name: 股票名称
+            max_results: 最大返回结果数
+            focus_keywords: 重点关注的关键词列表
+            
+        Returns:
+            SearchResponse 对象
+        """
+        # 智能确定搜索时间范围
+        # 策略：
+        # 1. 周二至周五：搜索近1天（24小时）
+        # 2. 周六、周日：搜索近2天（覆盖周末）
+        # 3. 周一：搜索近3天（覆盖周末）
+        search_days = _WEEKDAY_DAYS[datetime.now().weekday()]
+        
+        # 构建搜索查询（优化搜索效果）
+        if focus_keywords:
+            # 如果提供了关键词，直接使用关键词作为查询
+            query = " ".join(focus_keywords)
+        else:
+            # 默认主查询：股票名称 + 核心关键词
+            query = f"{stock_name} {stock_code} 股票 最新消息"
+        
+        logger.info(f"搜索股票新闻: {stock_name}({stock_code}), query='{query}', 时间范围: 近{search_days}天")
+        
+        # 依次尝试各个搜索引擎
+        for provider in self._providers:
             if not provider.is_available:
                 continue
             
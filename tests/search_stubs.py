@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 搜索引擎测试桩
+===================================
+
+职责：
+1. 提供可配置的桩搜索引擎（延迟、失败、可用性），供搜索相关测试共用
+"""
+
+import threading
+import time
+from typing import Optional
+
+from src.search_service import BaseSearchProvider, SearchResponse, SearchResult
+
+
+class StubSearchProvider(BaseSearchProvider):
+    """
+    桩搜索引擎
+
+    每次搜索返回 max_results 条结果，第 i 条的标题为 "{query} {name} 新闻 {i}"，
+    URL 为 https://{name小写}.example.com/{i}；调用次数记录在 calls 中。
+    """
+
+    def __init__(
+        self,
+        name: str = "Stub",
+        delay: float = 0.0,
+        release: Optional[threading.Event] = None,
+        fail: bool = False,
+        available: bool = True,
+    ):
+        """
+        Args:
+            name: 引擎名称
+            delay: 每次搜索的延迟（秒）
+            release: 提供时改为等待该事件（最长 delay 秒），便于测试结束时放行
+            fail: 是否返回失败响应
+            available: is_available 的返回值（可随时修改）
+        """
+        super().__init__(["stub-key"], name)
+        self.delay = delay
+        self.release = release
+        self.fail = fail
+        self.available = available
+        self.calls = 0
+        self.finished = threading.Event()
+        self._calls_lock = threading.Lock()
+
+    @property
+    def is_available(self) -> bool:
+        return self.available
+
+    def _do_search(self, query: str, api_key: str, max_results: int, days: int = 7) -> SearchResponse:
+        with self._calls_lock:
+            self.calls += 1
+        if self.release is not None:
+            self.release.wait(self.delay)
+        elif self.delay:
+            time.sleep(self.delay)
+        self.finished.set()
+
+        if self.fail:
+            return SearchResponse(query=query, results=[], provider=self.name, success=False, error_message="HTTP 500")
+        host = f"{self.name.lower()}.example.com"
+        results = [
+            SearchResult(title=f"{query} {self.name} 新闻 {i}", snippet="...", url=f"https://{host}/{i}", source=host)
+            for i in range(max_results)
+        ]
+        return SearchResponse(query=query, results=results, provider=self.name, success=True)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - AIMD 自适应并发控制单元测试
+===================================
+
+职责：
+1. 验证同时占用的名额不超过当前并发数
+2. 验证按平均耗时加性增、乘性减
+3. 验证限流后并发数减半并暂停放行
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from data_provider.http_utils import AIMDConcurrency
+
+
+class AIMDConcurrencyTestCase(unittest.TestCase):
+    """AIMD 并发控制测试"""
+
+    def test_slot_caps_active_requests(self) -> None:
+        """同时执行的请求数不超过当前并发数"""
+        controller = AIMDConcurrency(initial=2, max_limit=8)
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def task(_):
+            nonlocal active, peak
+            with controller.slot():
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.05)
+                with lock:
+                    active -= 1
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(task, range(6)))
+
+        self.assertEqual(peak, 2)
+
+    def test_adjust_increases_when_fast(self) -> None:
+        """平均耗时低于目标时并发数 +0.5，不超过上限"""
+        controller = AIMDConcurrency(initial=4, max_limit=5, target_latency=1.0)
+        with controller.slot():
+            pass
+
+        self.assertEqual(controller.adjust(), 4.5)
+        self.assertEqual(controller.adjust(), 5)
+        self.assertEqual(controller.adjust(), 5)
+
+    def test_adjust_halves_when_slow(self) -> None:
+        """平均耗时超过目标时并发数减半，不低于下限"""
+        controller = AIMDConcurrency(initial=4, min_limit=1, target_latency=0.01)
+        with controller.slot():
+            time.sleep(0.03)
+
+        self.assertEqual(controller.adjust(), 2)
+        self.assertEqual(controller.adjust(), 1)
+        self.assertEqual(controller.adjust(), 1)
+
+    def test_throttle_halves_and_pauses(self) -> None:
+        """触发限流后并发数减半，Retry-After 期间不放行新请求"""
+        controller = AIMDConcurrency(initial=4)
+        controller.on_throttle(retry_after=0.2)
+        self.assertEqual(controller.limit, 2)
+
+        start = time.monotonic()
+        with controller.slot():
+            pass
+        elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.15)
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
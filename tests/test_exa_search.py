@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - Exa 搜索服务单元测试
+===================================
+
+职责：
+1. 验证 401/403 响应将 API Key 标记为不可用
+2. 验证适配器跳过 API Key 被拒绝的服务实例
+"""
+
+import unittest
+
+import requests
+
+from src.exa_search import ExaSearchError, ExaSearchService
+from src.exa_search_adapter import ExaSearchProviderAdapter
+
+
+def _response(status_code: int) -> requests.Response:
+    """构造指定状态码的 Response"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b'{"results": []}'
+    return response
+
+
+class _FakeSession:
+    """按固定状态码响应、记录请求次数的会话"""
+
+    def __init__(self, post_status: int = 200, get_status: int = 200):
+        self.post_status = post_status
+        self.get_status = get_status
+        self.gets = 0
+
+    def post(self, *args, **kwargs) -> requests.Response:
+        return _response(self.post_status)
+
+    def get(self, *args, **kwargs) -> requests.Response:
+        self.gets += 1
+        return _response(self.get_status)
+
+
+class ExaAuthRejectedTestCase(unittest.TestCase):
+    """Exa API Key 被拒绝测试"""
+
+    def test_search_401_marks_unavailable(self) -> None:
+        """搜索返回 401 后实例不可用，且不再发起探测请求"""
+        service = ExaSearchService(api_key="exa-bad-key")
+        service.session = _FakeSession(post_status=401)
+
+        with self.assertRaises(ExaSearchError):
+            service.search("贵州茅台", num_results=1, cache_ttl=0)
+
+        self.assertTrue(service.auth_rejected)
+        self.assertFalse(service.is_available())
+        self.assertEqual(service.session.gets, 0)
+
+    def test_probe_403_marks_unavailable(self) -> None:
+        """健康探测返回 403 时视为不可用"""
+        service = ExaSearchService(api_key="exa-bad-key")
+        service.session = _FakeSession(get_status=403)
+
+        self.assertFalse(service.is_available())
+        self.assertTrue(service.auth_rejected)
+
+    def test_probe_ok_is_available(self) -> None:
+        """探测正常时可用"""
+        service = ExaSearchService(api_key="exa-good-key")
+        service.session = _FakeSession()
+
+        self.assertTrue(service.is_available())
+        self.assertFalse(service.auth_rejected)
+
+    def test_adapter_skips_rejected_service(self) -> None:
+        """适配器轮询跳过被拒绝的实例，全部被拒绝时不可用"""
+        adapter = ExaSearchProviderAdapter(["exa-bad-key", "exa-good-key"])
+        bad, good = adapter._exa_services
+        bad.auth_rejected = True
+
+        self.assertTrue(adapter.is_available)
+        self.assertTrue(all(adapter._get_next_service() is good for _ in range(3)))
+
+        good.auth_rejected = True
+        self.assertFalse(adapter.is_available)
+        self.assertIsNone(adapter._get_next_service())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - Exa 搜索适配器单元测试
+===================================
+
+职责：
+1. 验证 Exa 返回 null 字段时单条结果不会导致整体失败
+2. 验证并发数等正整数环境变量的无效值回退到默认值
+"""
+
+import os
+import unittest
+from unittest import mock
+
+from src.exa_search_adapter import ExaSearchProviderAdapter, _extract_domain
+from src.search_service import get_env_positive_int
+
+
+class ExtractDomainTestCase(unittest.TestCase):
+    """域名提取测试"""
+
+    def test_extract_domain(self) -> None:
+        """正常 URL 提取域名并去掉 www. 前缀"""
+        self.assertEqual(_extract_domain("https://www.Sina.com.cn/finance/1.html"), "sina.com.cn")
+
+    def test_invalid_url_returns_unknown(self) -> None:
+        """None、空串或非 URL 返回未知来源，不抛异常"""
+        self.assertEqual(_extract_domain(None), "未知来源")
+        self.assertEqual(_extract_domain(""), "未知来源")
+        self.assertEqual(_extract_domain("not a url"), "未知来源")
+
+
+class ExaAdapterNullFieldTestCase(unittest.TestCase):
+    """Exa null 字段处理测试"""
+
+    def test_null_fields_do_not_fail_response(self) -> None:
+        """url/title/summary 为 null 的条目按空字符串处理，其余条目正常返回"""
+        adapter = ExaSearchProviderAdapter(["exa-test-key"])
+        adapter._exa_services[0].search_and_extract = lambda query, num_results: [
+            {"title": None, "summary": None, "url": None},
+            {"title": "茅台发布新品", "summary": "公司发布新品...", "url": "https://news.example.com/a"},
+        ]
+
+        response = adapter.search("贵州茅台", max_results=2)
+
+        self.assertTrue(response.success)
+        self.assertEqual([item.url for item in response.results], ["", "https://news.example.com/a"])
+        self.assertEqual([item.source for item in response.results], ["未知来源", "news.example.com"])
+        self.assertEqual(response.results[0].title, "")
+
+
+class EnvPositiveIntTestCase(unittest.TestCase):
+    """正整数环境变量测试"""
+
+    def test_invalid_values_fall_back_to_default(self) -> None:
+        """0、负数、非数字和空串回退到默认值"""
+        for value in ("0", "-2", "abc", ""):
+            with self.subTest(value=value), mock.patch.dict(os.environ, {"PSEARCH_WORKERS": value}):
+                self.assertEqual(get_env_positive_int("PSEARCH_WORKERS", 16), 16)
+
+    def test_valid_value_used(self) -> None:
+        """合法正整数按设置值使用，未设置时取默认值"""
+        with mock.patch.dict(os.environ, {"PSEARCH_WORKERS": "5"}):
+            self.assertEqual(get_env_positive_int("PSEARCH_WORKERS", 16), 5)
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertEqual(get_env_positive_int("PSEARCH_WORKERS", 16), 16)
+
+    def test_exa_concurrency_zero_does_not_deadlock(self) -> None:
+        """EXA_CONCURRENCY=0/abc 时信号量使用默认的 3 个名额"""
+        for value in ("0", "abc"):
+            with self.subTest(value=value), mock.patch.dict(os.environ, {"EXA_CONCURRENCY": value}):
+                adapter = ExaSearchProviderAdapter(["exa-test-key"])
+                self.assertEqual(adapter._search_slots._value, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
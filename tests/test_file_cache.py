@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 磁盘 TTL 缓存单元测试
+===================================
+
+职责：
+1. 验证缓存读写与命名空间隔离
+2. 验证过期条目被删除、损坏文件按未命中处理
+3. 验证清理过期文件与写入失败时的临时文件
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from data_provider.http_utils import FileCache
+
+
+class FileCacheTestCase(unittest.TestCase):
+    """磁盘缓存测试"""
+
+    def setUp(self) -> None:
+        """为每个用例创建独立缓存目录"""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.cache = FileCache(self._temp_dir.name, ttl=60)
+
+    def tearDown(self) -> None:
+        """清理缓存目录"""
+        self._temp_dir.cleanup()
+
+    def test_set_and_get(self) -> None:
+        """写入后可读回相同数据"""
+        data = {"prices": [[1700000000000, 35000.5]], "name": "比特币"}
+        self.cache.set("bitcoin:365", data)
+
+        self.assertEqual(self.cache.get("bitcoin:365"), data)
+        self.assertIsNone(self.cache.get("ethereum:365"))
+
+    def test_namespaces_are_isolated(self) -> None:
+        """相同 key 在不同命名空间互不影响"""
+        self.cache.set("key", 1, namespace="a")
+        self.cache.set("key", 2, namespace="b")
+
+        self.assertEqual(self.cache.get("key", namespace="a"), 1)
+        self.assertEqual(self.cache.get("key", namespace="b"), 2)
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_expired_entry_is_removed(self) -> None:
+        """过期条目返回 None 并删除缓存文件"""
+        self.cache.set("key", 1, ttl=0.05)
+        path = self.cache._path("key")
+        self.assertTrue(os.path.exists(path))
+        time.sleep(0.1)
+
+        self.assertIsNone(self.cache.get("key"))
+        self.assertFalse(os.path.exists(path))
+
+    def test_corrupted_file_is_a_miss(self) -> None:
+        """损坏的缓存文件按未命中处理"""
+        self.cache.set("key", 1)
+        with open(self.cache._path("key"), "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_non_dict_entry_is_a_miss(self) -> None:
+        """内容不是对象的 JSON 文件按未命中处理"""
+        self.cache.set("key", 1)
+        with open(self.cache._path("key"), "w", encoding="utf-8") as f:
+            f.write("[1, 2, 3]")
+
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_failed_write_removes_tmp_file(self) -> None:
+        """序列化中途失败时不残留临时文件，也不留下缓存文件"""
+        self.cache.set("key", {"ok": 1, "bad": object()})
+
+        leftovers = [name for _, _, files in os.walk(self._temp_dir.name) for name in files]
+        self.assertEqual(leftovers, [])
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_sweep_removes_expired_and_corrupted_files(self) -> None:
+        """清理删除从未再读取的过期文件和损坏文件，保留未过期文件"""
+        self.cache.set("2025-01-01", 1, ttl=0.05, namespace="market_chart")
+        self.cache.set("fresh", 2, namespace="market_chart")
+        with open(self.cache._path("broken"), "w", encoding="utf-8") as f:
+            f.write("{not json")
+        time.sleep(0.1)
+
+        self.assertEqual(self.cache.sweep(), 2)
+        self.assertFalse(os.path.exists(self.cache._path("2025-01-01", namespace="market_chart")))
+        self.assertEqual(self.cache.get("fresh", namespace="market_chart"), 2)
+
+    def test_sweep_keeps_recent_tmp_files(self) -> None:
+        """可能仍在写入的临时文件保留，过旧的临时文件删除"""
+        os.makedirs(self._temp_dir.name, exist_ok=True)
+        recent = os.path.join(self._temp_dir.name, "a.json.1.2.tmp")
+        old = os.path.join(self._temp_dir.name, "b.json.1.2.tmp")
+        for path in (recent, old):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("{")
+        past = time.time() - 2 * 3600
+        os.utime(old, (past, past))
+
+        self.cache.sweep()
+
+        self.assertTrue(os.path.exists(recent))
+        self.assertFalse(os.path.exists(old))
+
+    def test_sweep_on_init_and_every_n_writes(self) -> None:
+        """创建时清理一次，之后每 sweep_every 次写入清理一次"""
+        self.cache.set("old", 1, ttl=0.05)
+        time.sleep(0.1)
+        FileCache(self._temp_dir.name, ttl=60)
+        self.assertFalse(os.path.exists(self.cache._path("old")))
+
+        cache = FileCache(self._temp_dir.name, ttl=60, sweep_every=3)
+        cache.set("old", 1, ttl=0.05)
+        time.sleep(0.1)
+        cache.set("a", 1)
+        self.assertTrue(os.path.exists(cache._path("old")))
+        cache.set("b", 2)
+        self.assertFalse(os.path.exists(cache._path("old")))
+
+
+if __name__ == "__main__":
+    unittest.main()
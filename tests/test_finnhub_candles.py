@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - Finnhub K线请求单元测试
+===================================
+
+职责：
+1. 验证K线请求窗口按粒度对齐，粒度内重复调用参数不变（可命中磁盘缓存）
+2. 验证日线日期为日粒度
+3. 验证K线缓存有效期随粒度缩放，过期缓存文件会被清理
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+import requests
+
+from data_provider.finnhub_fetcher import FinnhubFetcher
+from data_provider.http_utils import FileCache
+
+
+class FinnhubCandleWindowTestCase(unittest.TestCase):
+    """K线请求窗口对齐测试"""
+
+    def setUp(self) -> None:
+        """拦截请求，只记录参数"""
+        self.fetcher = FinnhubFetcher(api_key="finnhub-test-key")
+        self.requests = []
+        self.fetcher._make_request = lambda endpoint, params: self.requests.append(params) or None
+
+    def test_daily_window_aligned_to_day(self) -> None:
+        """日线窗口对齐到天，覆盖当前时间，相隔数秒的调用参数相同"""
+        self.fetcher.get_technical_indicator("AAPL")
+        time.sleep(1.1)
+        self.fetcher.get_technical_indicator("AAPL")
+
+        first, second = self.requests
+        self.assertEqual(first, second)
+        self.assertEqual(first["to"] % 86400, 0)
+        self.assertGreaterEqual(first["to"], time.time() - 2)
+        self.assertEqual(first["to"] - first["from"], 365 * 86400)
+
+    def test_intraday_window_aligned_to_resolution(self) -> None:
+        """分钟线窗口按分钟数对齐"""
+        self.fetcher.get_technical_indicator("AAPL", resolution="5")
+
+        self.assertEqual(self.requests[0]["to"] % 300, 0)
+
+
+class FinnhubCandleDateTestCase(unittest.TestCase):
+    """K线日期粒度测试"""
+
+    def test_dates_normalized_to_day(self) -> None:
+        """不在UTC零点的K线时间戳截到当天零点"""
+        fetcher = FinnhubFetcher(api_key="finnhub-test-key")
+        fetcher._make_request = lambda endpoint, params: {
+            "s": "ok",
+            "t": [1700000000, 1700086400],
+            "o": [1.0, 2.0], "h": [1.0, 2.0], "l": [1.0, 2.0], "c": [1.0, 2.0], "v": [10.0, 20.0],
+        }
+
+        df = fetcher._fetch_raw_data("AAPL", "2023-11-01", "2023-11-30")
+
+        self.assertEqual(list(df["date"]), [pd.Timestamp("2023-11-14"), pd.Timestamp("2023-11-15")])
+
+
+class FinnhubCandleCacheTestCase(unittest.TestCase):
+    """K线磁盘缓存测试"""
+
+    def setUp(self) -> None:
+        """使用临时缓存目录"""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._env = mock.patch.dict(os.environ, {"DATA_CACHE_DIR": self._temp_dir.name})
+        self._env.start()
+
+    def tearDown(self) -> None:
+        """恢复环境并清理缓存目录"""
+        self._env.stop()
+        self._temp_dir.cleanup()
+
+    def _cached_ttl(self, resolution: str) -> float:
+        """请求一次K线，返回写入磁盘缓存的有效期"""
+        fetcher = FinnhubFetcher(api_key="finnhub-test-key")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"s": "ok", "c": [], "t": []}'
+        params = {"symbol": "AAPL", "resolution": resolution, "from": 0, "to": 86400}
+        with mock.patch.object(fetcher.session, "get", return_value=response):
+            fetcher._make_request("stock/candle", params)
+
+        entry_dir = os.path.join(self._temp_dir.name, "finnhub", "stock", "candle")
+        (name,) = os.listdir(entry_dir)
+        with open(os.path.join(entry_dir, name), encoding="utf-8") as f:
+            return json.load(f)["ttl"]
+
+    def test_intraday_ttl_matches_resolution(self) -> None:
+        """5 分钟线只缓存 5 分钟"""
+        self.assertEqual(self._cached_ttl("5"), 300)
+
+    def test_daily_ttl_is_one_day(self) -> None:
+        """日线缓存 1 天"""
+        self.assertEqual(self._cached_ttl("D"), 86400)
+
+    def test_expired_candle_files_swept_on_init(self) -> None:
+        """之前运行留下的过期K线缓存在创建 Fetcher 时被删除"""
+        cache = FileCache(os.path.join(self._temp_dir.name, "finnhub"))
+        cache.set("stock/candle?old-window", {"s": "ok"}, ttl=0.05, namespace="stock/candle")
+        path = cache._path("stock/candle?old-window", namespace="stock/candle")
+        time.sleep(0.1)
+
+        FinnhubFetcher(api_key="finnhub-test-key")
+
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - Finnhub 代码转换单元测试
+===================================
+
+职责：
+1. 验证 A 股按首位路由到上交所/深交所
+2. 验证以 0 开头的港股代码路由到 .HK
+3. 验证已带后缀的代码不会重复追加后缀
+"""
+
+import unittest
+
+from data_provider.finnhub_fetcher import _to_finnhub_symbol
+
+
+class FinnhubSymbolTestCase(unittest.TestCase):
+    """Finnhub 代码转换测试"""
+
+    def test_a_share_exchange_suffix(self) -> None:
+        """6/5 开头为上交所，0/3 开头为深交所"""
+        self.assertEqual(_to_finnhub_symbol("600519"), "600519.SS")
+        self.assertEqual(_to_finnhub_symbol("510300"), "510300.SS")
+        self.assertEqual(_to_finnhub_symbol("000001"), "000001.SZ")
+        self.assertEqual(_to_finnhub_symbol("300750"), "300750.SZ")
+
+    def test_hk_code_with_leading_zero(self) -> None:
+        """5 位港股代码（含前导 0）路由到 .HK 而不是深交所"""
+        self.assertEqual(_to_finnhub_symbol("00700"), "00700.HK")
+        self.assertEqual(_to_finnhub_symbol("09988"), "09988.HK")
+
+    def test_suffixed_code_not_double_suffixed(self) -> None:
+        """已带后缀的代码原样返回，不会再追加后缀"""
+        self.assertEqual(_to_finnhub_symbol("600519.SS"), "600519.SS")
+        self.assertEqual(_to_finnhub_symbol("000001.SZ"), "000001.SZ")
+        self.assertEqual(_to_finnhub_symbol("00700.HK"), "00700.HK")
+
+    def test_us_ticker_upper_cased(self) -> None:
+        """美股代码统一转为大写"""
+        self.assertEqual(_to_finnhub_symbol("aapl"), "AAPL")
+        self.assertEqual(_to_finnhub_symbol("TSLA"), "TSLA")
+
+
+if __name__ == "__main__":
+    unittest.main()
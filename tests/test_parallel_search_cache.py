@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 并行搜索结果缓存单元测试
+===================================
+
+职责：
+1. 验证相同查询命中缓存，不再请求搜索引擎
+2. 验证调用方修改返回结果不会污染缓存
+"""
+
+import unittest
+
+from src.parallel_search import ParallelSearchService
+from tests.search_stubs import StubSearchProvider
+
+
+class ParallelSearchCacheTestCase(unittest.TestCase):
+    """并行搜索结果缓存测试"""
+
+    def setUp(self) -> None:
+        """单引擎服务，开启结果缓存"""
+        self.provider = StubSearchProvider("Counting")
+        self.service = ParallelSearchService([self.provider], cache_ttl=60)
+
+    def test_repeated_query_hits_cache(self) -> None:
+        """相同查询第二次命中缓存"""
+        first = self.service.search_parallel("贵州茅台", max_results=5)
+        second = self.service.search_parallel("贵州茅台", max_results=5)
+
+        self.assertEqual(self.provider.calls, 1)
+        self.assertEqual(first, second)
+
+    def test_mutating_miss_result_does_not_corrupt_cache(self) -> None:
+        """修改未命中时返回的结果（含内层字典），之后命中缓存仍得到原始结果"""
+        first = self.service.search_parallel("贵州茅台", max_results=5)
+        first.merged_results[0]["title"] = "MUTATED"
+        first.results[0]["provider"] = "X"
+        first.results[0]["results"][0]["url"] = "https://mutated.example.com"
+        first.providers_used.append("X")
+
+        second = self.service.search_parallel("贵州茅台", max_results=5)
+
+        self.assertEqual(self.provider.calls, 1)
+        self.assertEqual(second.merged_results[0]["title"], "贵州茅台 Counting 新闻 0")
+        self.assertEqual(second.results[0]["provider"], "Counting")
+        self.assertEqual(second.results[0]["results"][0]["url"], "https://counting.example.com/0")
+        self.assertEqual(second.providers_used, ["Counting"])
+
+    def test_mutating_hit_result_does_not_corrupt_cache(self) -> None:
+        """修改命中缓存时返回的结果，不影响下一次命中"""
+        self.service.search_parallel("贵州茅台", max_results=5)
+        hit = self.service.search_parallel("贵州茅台", max_results=5)
+        hit.merged_results[0]["title"] = "MUTATED"
+        hit.results[0]["results"][0]["title"] = "MUTATED"
+
+        again = self.service.search_parallel("贵州茅台", max_results=5)
+
+        self.assertEqual(again.merged_results[0]["title"], "贵州茅台 Counting 新闻 0")
+        self.assertEqual(again.results[0]["results"][0]["title"], "贵州茅台 Counting 新闻 0")
+
+
+if __name__ == "__main__":
+    unittest.main()
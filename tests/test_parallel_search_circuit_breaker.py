@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 并行搜索熔断单元测试
+===================================
+
+职责：
+1. 验证连续失败的引擎熔断后被跳过
+2. 验证熔断状态可通过 get_provider_health 查看
+"""
+
+import unittest
+
+from src.parallel_search import _BREAKER_FAILURE_THRESHOLD, ParallelSearchService
+from tests.search_stubs import StubSearchProvider
+
+
+class ParallelSearchCircuitBreakerTestCase(unittest.TestCase):
+    """并行搜索熔断测试"""
+
+    def setUp(self) -> None:
+        """一个正常引擎、一个持续失败的引擎，关闭结果缓存"""
+        self.healthy = StubSearchProvider("Healthy")
+        self.broken = StubSearchProvider("Broken", fail=True)
+        self.service = ParallelSearchService([self.healthy, self.broken], cache_ttl=0)
+
+    def test_failing_provider_skipped_after_threshold(self) -> None:
+        """连续失败达到阈值后不再请求该引擎，但仍记为失败"""
+        for _ in range(_BREAKER_FAILURE_THRESHOLD):
+            self.service.search_parallel("贵州茅台", max_results=5)
+        self.assertEqual(self.broken.calls, _BREAKER_FAILURE_THRESHOLD)
+
+        result = self.service.search_parallel("贵州茅台", max_results=5)
+
+        self.assertEqual(self.broken.calls, _BREAKER_FAILURE_THRESHOLD)
+        self.assertEqual(self.healthy.calls, _BREAKER_FAILURE_THRESHOLD + 1)
+        self.assertEqual(result.providers_used, ["Healthy"])
+        self.assertEqual(result.failed_providers, ["Broken"])
+
+    def test_provider_health_reports_open_circuit(self) -> None:
+        """熔断后的引擎状态为 open，正常引擎为 closed"""
+        for _ in range(_BREAKER_FAILURE_THRESHOLD):
+            self.service.search_parallel("贵州茅台", max_results=5)
+
+        health = self.service.get_provider_health()
+
+        self.assertEqual(health["Broken"]["circuit"], "open")
+        self.assertEqual(health["Healthy"]["circuit"], "closed")
+        self.assertTrue(health["Broken"]["available"])
+
+
+if __name__ == "__main__":
+    unittest.main()
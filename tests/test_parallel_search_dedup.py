@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 并行搜索结果去重单元测试
+===================================
+
+职责：
+1. 验证标题归一化后的精确去重
+2. 验证 SimHash 近似重复标题的合并
+3. 验证各引擎结果轮流入选
+"""
+
+import unittest
+
+from src.parallel_search import ParallelSearchService
+from src.search_service import SearchResponse, SearchResult
+from tests.search_stubs import StubSearchProvider
+
+
+def _result(title: str, url: str) -> SearchResult:
+    """构造 SearchResult 快捷函数"""
+    return SearchResult(title=title, snippet="...", url=url, source="")
+
+
+def _response(provider: str, results) -> SearchResponse:
+    """构造 SearchResponse 快捷函数"""
+    return SearchResponse(query="贵州茅台", results=results, provider=provider, success=True)
+
+
+class ParallelSearchDedupTestCase(unittest.TestCase):
+    """并行搜索合并去重测试"""
+
+    def setUp(self) -> None:
+        """无需真实引擎，只测试合并逻辑"""
+        self.service = ParallelSearchService([StubSearchProvider("Idle")], cache_ttl=0)
+
+    def _merge(self, *responses, max_results: int = 10):
+        return self.service._merge_results(
+            [(response.provider, response) for response in responses], max_results
+        )
+
+    def test_normalized_title_duplicates_merged(self) -> None:
+        """仅标点、全半角、大小写不同的同站标题视为重复"""
+        merged = self._merge(
+            _response("A", [_result("贵州茅台发布2024年年度报告，净利润同比增长15%", "https://www.news.com/a")]),
+            _response("B", [_result("贵州茅台发布２０２４年年度报告：净利润同比增长15%!", "https://news.com/b")]),
+        )
+
+        self.assertEqual([item.url for item in merged], ["https://www.news.com/a"])
+
+    def test_simhash_near_duplicates_merged(self) -> None:
+        """加了栏目前缀的改写标题按近似重复合并，不同新闻保留"""
+        merged = self._merge(
+            _response("A", [_result("贵州茅台发布2024年年度报告，净利润同比增长15%", "https://a.com/1")]),
+            _response("B", [
+                _result("【快讯】贵州茅台发布2024年年度报告，净利润同比增长15%", "https://b.com/1"),
+                _result("宁德时代与车企签订长期电池供货协议", "https://b.com/2"),
+            ]),
+        )
+
+        self.assertEqual([item.url for item in merged], ["https://a.com/1", "https://b.com/2"])
+
+    def test_results_interleaved_and_truncated(self) -> None:
+        """各引擎结果轮流入选，截断时每个引擎的第一名都保留"""
+        merged = self._merge(
+            _response("A", [
+                _result("央行宣布下调存款准备金率", "https://a.com/1"),
+                _result("沪指周线三连阳成交额放大", "https://a.com/2"),
+            ]),
+            _response("B", [
+                _result("新能源汽车出口量创历史新高", "https://b.com/1"),
+                _result("白酒板块午后集体拉升走强", "https://b.com/2"),
+            ]),
+            max_results=3,
+        )
+
+        self.assertEqual(
+            [item.url for item in merged],
+            ["https://a.com/1", "https://b.com/1", "https://a.com/2"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
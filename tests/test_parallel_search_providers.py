@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 并行搜索引擎可用性单元测试
+===================================
+
+职责：
+1. 验证定期重新筛选可用引擎
+2. 验证恢复可用的引擎也能获得并发名额
+"""
+
+import unittest
+
+from src.parallel_search import _HEALTH_CHECK_INTERVAL, ParallelSearchService
+from tests.search_stubs import StubSearchProvider
+
+
+class ParallelSearchProvidersTestCase(unittest.TestCase):
+    """引擎可用性刷新测试"""
+
+    def test_restored_providers_get_concurrency(self) -> None:
+        """启动时不可用的引擎恢复后重新参与搜索，并发上限按全部引擎计算"""
+        providers = [
+            StubSearchProvider("A"),
+            StubSearchProvider("B", available=False),
+            StubSearchProvider("C", available=False),
+        ]
+        service = ParallelSearchService(providers, max_workers=3, cache_ttl=0)
+        self.assertEqual([p.name for p in service.providers], ["A"])
+        self.assertEqual(service.max_workers, 3)
+
+        for provider in providers:
+            provider.available = True
+        service._last_health_check -= _HEALTH_CHECK_INTERVAL
+        service._refresh_providers()
+
+        self.assertEqual([p.name for p in service.providers], ["A", "B", "C"])
+        self.assertEqual(service.max_workers, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 并行搜索请求合并单元测试
+===================================
+
+职责：
+1. 验证并发的相同搜索只执行一次
+2. 验证不同查询互不合并，完成后可再次执行
+"""
+
+import asyncio
+import unittest
+
+from src.parallel_search import ParallelSearchService
+from tests.search_stubs import StubSearchProvider
+
+
+class ParallelSearchSingleFlightTestCase(unittest.TestCase):
+    """并行搜索 single-flight 测试"""
+
+    def setUp(self) -> None:
+        """关闭结果缓存，只观察请求合并"""
+        self.provider = StubSearchProvider("Counting", delay=0.1)
+        self.service = ParallelSearchService([self.provider], cache_ttl=0)
+
+    def test_concurrent_identical_searches_coalesced(self) -> None:
+        """同时发起的相同搜索共用一次执行"""
+        async def run():
+            return await asyncio.gather(
+                *(self.service.search_parallel_async("贵州茅台", max_results=5) for _ in range(5))
+            )
+
+        results = asyncio.run(run())
+
+        self.assertEqual(self.provider.calls, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self.service._inflight, {})
+
+    def test_different_queries_not_coalesced(self) -> None:
+        """不同查询各自执行"""
+        async def run():
+            return await asyncio.gather(
+                self.service.search_parallel_async("贵州茅台", max_results=5),
+                self.service.search_parallel_async("宁德时代", max_results=5),
+            )
+
+        asyncio.run(run())
+
+        self.assertEqual(self.provider.calls, 2)
+
+    def test_completed_search_runs_again(self) -> None:
+        """前一次搜索完成后，相同请求重新执行"""
+        self.service.search_parallel("贵州茅台", max_results=5)
+        self.service.search_parallel("贵州茅台", max_results=5)
+
+        self.assertEqual(self.provider.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
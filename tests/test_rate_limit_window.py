@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 滑动窗口限流单元测试
+===================================
+
+职责：
+1. 验证窗口内请求数达到上限时等待最早请求滑出窗口
+2. 验证 X-Ratelimit-Remaining / X-Ratelimit-Reset 响应头的暂停逻辑
+"""
+
+import time
+import unittest
+
+import requests
+
+from data_provider.http_utils import RateLimitWindowMixin
+
+
+class _Limited(RateLimitWindowMixin):
+    """混入滑动窗口限流的最小对象"""
+
+    def __init__(self, limit=2, window=0.2, min_remaining=2):
+        self._init_rate_window(limit=limit, window=window, min_remaining=min_remaining)
+
+
+def _response(remaining, reset) -> requests.Response:
+    """构造带限流响应头的 Response"""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["X-Ratelimit-Remaining"] = str(remaining)
+    response.headers["X-Ratelimit-Reset"] = str(reset)
+    return response
+
+
+class RateLimitWindowTestCase(unittest.TestCase):
+    """滑动窗口限流测试"""
+
+    def _timed_wait(self, limited: _Limited) -> float:
+        start = time.monotonic()
+        limited._rate_window_wait()
+        return time.monotonic() - start
+
+    def test_waits_when_window_full(self) -> None:
+        """窗口内已达上限时，第 limit+1 次请求等待到最早请求滑出窗口"""
+        limited = _Limited(limit=2, window=0.2)
+        self.assertLess(self._timed_wait(limited), 0.05)
+        self.assertLess(self._timed_wait(limited), 0.05)
+
+        elapsed = self._timed_wait(limited)
+        self.assertGreaterEqual(elapsed, 0.15)
+        self.assertLess(elapsed, 1.0)
+
+    def test_low_remaining_pauses_until_reset(self) -> None:
+        """剩余额度不足时暂停到 Reset 时间"""
+        limited = _Limited(limit=None, window=60)
+        limited._rate_window_observe(_response(remaining=1, reset=time.time() + 0.2))
+
+        elapsed = self._timed_wait(limited)
+        self.assertGreaterEqual(elapsed, 0.15)
+        self.assertLess(elapsed, 1.0)
+
+    def test_enough_remaining_does_not_pause(self) -> None:
+        """剩余额度充足时不暂停"""
+        limited = _Limited(limit=None, window=60)
+        limited._rate_window_observe(_response(remaining=50, reset=time.time() + 30))
+
+        self.assertEqual(limited._rate_pause_until, 0.0)
+        self.assertLess(self._timed_wait(limited), 0.05)
+
+    def test_pause_capped_at_one_window(self) -> None:
+        """异常的 Reset 时间最多暂停一个窗口"""
+        limited = _Limited(limit=None, window=0.2)
+        limited._rate_window_observe(_response(remaining=0, reset=time.time() + 3600))
+
+        self.assertLessEqual(limited._rate_pause_until, time.time() + 0.2)
+
+    def test_invalid_headers_are_ignored(self) -> None:
+        """缺失或无法解析的响应头不影响限流状态"""
+        limited = _Limited(limit=None, window=60)
+        limited._rate_window_observe(_response(remaining="n/a", reset="soon"))
+        limited._rate_window_observe(requests.Response())
+
+        self.assertEqual(limited._rate_pause_until, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 多源并行搜索单元测试
+===================================
+
+职责：
+1. 验证已获得足够去重结果时不再等待较慢的搜索引擎
+"""
+
+import threading
+import time
+import unittest
+
+from src.search_service import SearchService
+from tests.search_stubs import StubSearchProvider
+
+
+class SearchParallelEarlyStopTestCase(unittest.TestCase):
+    """并行搜索提前结束测试"""
+
+    def setUp(self) -> None:
+        """构造两个快速引擎与一个慢速引擎"""
+        self._release = threading.Event()
+        self.slow = StubSearchProvider("Slow", delay=5.0, release=self._release)
+        self.service = SearchService()
+        self.service._providers = [
+            StubSearchProvider("FastA"),
+            StubSearchProvider("FastB"),
+            self.slow,
+        ]
+
+    def tearDown(self) -> None:
+        """放行慢速引擎，避免线程池残留阻塞"""
+        self._release.set()
+
+    def test_returns_before_slow_provider(self) -> None:
+        """两个快速引擎满额返回后即结束，不等待慢速引擎"""
+        start = time.perf_counter()
+        response = self.service.search_parallel("贵州茅台", max_results_per_engine=3)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 2.0)
+        self.assertFalse(self.slow.finished.is_set())
+        self.assertTrue(response.success)
+        self.assertCountEqual(response.providers_used, ["FastA", "FastB"])
+        self.assertEqual(len(response.results), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
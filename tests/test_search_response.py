@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 搜索结果序列化单元测试
+===================================
+
+职责：
+1. 验证 to_dict() 每次返回独立的新字典
+2. 验证构建后修改的字段（如 search_time）反映在 to_dict() 中
+"""
+
+import unittest
+
+from src.search_service import SearchResponse, SearchResult
+
+
+class SearchResponseToDictTestCase(unittest.TestCase):
+    """搜索结果 to_dict 测试"""
+
+    def setUp(self) -> None:
+        """构造单条结果的响应"""
+        self.result = SearchResult(
+            title="茅台发布新产品",
+            snippet="公司发布新品...",
+            url="https://news.example.com/a",
+            source="example.com",
+        )
+        self.response = SearchResponse(query="贵州茅台", results=[self.result], provider="Bocha")
+
+    def test_result_to_dict_returns_new_dict(self) -> None:
+        """修改返回的字典不影响下一次调用"""
+        first = self.result.to_dict()
+        first["title"] = "MUTATED"
+
+        self.assertEqual(self.result.to_dict()["title"], "茅台发布新产品")
+
+    def test_response_to_dict_returns_new_dicts(self) -> None:
+        """修改返回的响应字典及其中的结果字典不影响下一次调用"""
+        first = self.response.to_dict()
+        first["provider"] = "X"
+        first["results"][0]["title"] = "MUTATED"
+
+        second = self.response.to_dict()
+        self.assertEqual(second["provider"], "Bocha")
+        self.assertEqual(second["results"][0]["title"], "茅台发布新产品")
+
+    def test_to_dict_reflects_later_assignment(self) -> None:
+        """先调用 to_dict() 再设置 search_time，之后的 to_dict() 取最新值"""
+        self.assertEqual(self.response.to_dict()["search_time"], 0.0)
+        self.response.search_time = 1.5
+
+        self.assertEqual(self.response.to_dict()["search_time"], 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 令牌桶限流单元测试
+===================================
+
+职责：
+1. 验证突发容量与令牌不足时的等待
+2. 验证限流后速率减半、成功后逐步恢复
+3. 验证 Retry-After 解析与指数退避
+"""
+
+import time
+import unittest
+
+from data_provider.http_utils import TokenBucket, backoff_delay, parse_retry_after
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    """令牌桶测试"""
+
+    def test_burst_within_capacity_does_not_wait(self) -> None:
+        """桶容量内的突发请求无需等待"""
+        bucket = TokenBucket(capacity=3, refill_rate=1)
+        waits = [bucket.acquire() for _ in range(3)]
+
+        self.assertEqual(waits, [0.0, 0.0, 0.0])
+
+    def test_acquire_waits_when_empty(self) -> None:
+        """令牌耗尽后按补充速率等待"""
+        bucket = TokenBucket(capacity=1, refill_rate=20)
+        bucket.acquire()
+
+        start = time.monotonic()
+        waited = bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        self.assertGreater(waited, 0)
+        self.assertGreaterEqual(elapsed, 0.04)
+        self.assertLess(elapsed, 1.0)
+
+    def test_throttle_halves_rate_with_floor(self) -> None:
+        """触发限流时速率减半，不低于下限"""
+        bucket = TokenBucket(capacity=1, refill_rate=8, min_rate=3)
+        bucket.on_throttle()
+        self.assertEqual(bucket.rate, 4)
+        bucket.on_throttle()
+        self.assertEqual(bucket.rate, 3)
+
+    def test_success_recovers_rate_up_to_max(self) -> None:
+        """成功请求使速率加性恢复，不超过上限"""
+        bucket = TokenBucket(capacity=1, refill_rate=8)
+        bucket.on_throttle()
+        for _ in range(200):
+            bucket.on_success()
+
+        self.assertEqual(bucket.rate, 8)
+
+
+class RetryHelpersTestCase(unittest.TestCase):
+    """限流重试辅助函数测试"""
+
+    def test_parse_retry_after(self) -> None:
+        """秒数格式正常解析，异常值返回 0，并限制最大值"""
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertEqual(parse_retry_after(None), 0.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertEqual(parse_retry_after("-3"), 0.0)
+        self.assertEqual(parse_retry_after("600", max_seconds=60), 60.0)
+
+    def test_backoff_delay(self) -> None:
+        """退避时间按指数增长并封顶"""
+        self.assertEqual([backoff_delay(i) for i in range(5)], [0.5, 1.0, 2.0, 4.0, 4.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
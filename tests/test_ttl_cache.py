@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 进程内 TTL 缓存单元测试
+===================================
+
+职责：
+1. 验证缓存命中、过期与单条目有效期
+2. 验证超出容量时淘汰最早写入的条目
+"""
+
+import time
+import unittest
+
+from data_provider.http_utils import TTLCache, make_cache_key
+
+
+class TTLCacheTestCase(unittest.TestCase):
+    """TTL 缓存测试"""
+
+    def test_get_hit_and_miss(self) -> None:
+        """未过期条目命中，缺失条目返回默认值，并记录命中次数"""
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("b", "default"), "default")
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_entry_expires(self) -> None:
+        """超过有效期的条目视为未命中并被移除"""
+        cache = TTLCache(maxsize=4, ttl=0.05)
+        cache.set("a", 1)
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_per_entry_ttl(self) -> None:
+        """单条目有效期优先于默认有效期"""
+        cache = TTLCache(maxsize=4, ttl=0.05)
+        cache.set("short", 1)
+        cache.set("long", 2, ttl=60)
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("long"), 2)
+
+    def test_evicts_oldest_when_full(self) -> None:
+        """超出容量时淘汰最早写入的条目，重写的条目视为最新"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)
+        cache.set("c", 4)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 3)
+        self.assertEqual(cache.get("c"), 4)
+
+    def test_cache_key_ignores_param_order(self) -> None:
+        """缓存键与参数顺序无关"""
+        self.assertEqual(
+            make_cache_key("https://api.example.com/coins", {"ids": "btc", "vs": "usd"}),
+            make_cache_key("https://api.example.com/coins", {"vs": "usd", "ids": "btc"}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()